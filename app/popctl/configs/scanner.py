@@ -1,16 +1,20 @@
 import logging
+import os
+import stat
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from popctl.domain.models import OrphanReason, OrphanStatus, PathType, ScannedEntry
 from popctl.domain.ownership import (
+    app_name_index,
     app_name_matches,
     classify_path_type,
     dpkg_owns_path,
-    get_installed_apps,
-    get_installed_packages,
+    get_installed_apps_and_packages,
     get_path_mtime,
     get_path_size,
+    load_dpkg_owned_paths,
 )
 from popctl.domain.protected import is_protected
 
@@ -29,6 +33,10 @@ _SHELL_DOTFILES: tuple[str, ...] = (
     ".wgetrc",
     ".curlrc",
 )
+_SHELL_DOTFILES_SET: frozenset[str] = frozenset(_SHELL_DOTFILES)
+
+# Worker threads for the ~/.config sweep; per-entry work is I/O-bound.
+_MAX_SCAN_WORKERS: int = min(32, (os.cpu_count() or 1) * 4)
 
 # Confidence scores by config type.
 _CONFIDENCE_DIRECTORY: float = 0.70
@@ -39,96 +47,117 @@ class ConfigScanner:
     def __init__(self) -> None:
         self._packages_cache: set[str] | None = None
         self._apps_cache: set[str] | None = None
-        self._dpkg_cache: dict[str, bool] = {}
+        self._dpkg_owned: frozenset[bytes] | None = None
         self._normalized_packages: set[str] | None = None
         self._normalized_apps: set[str] | None = None
+        self._app_index: frozenset[str] | None = None
 
     def scan(self) -> Iterator[ScannedEntry]:
         self._reset_caches()
-        yield from self._scan_config_dir()
-        yield from self._scan_dotfiles()
+        self._warm_caches()
+        # Resolved once so both passes agree on the home directory. Traversal
+        # below stays on plain strings; ScannedEntry.path is a str anyway.
+        home = str(Path.home())
+        yield from self._scan_config_dir(home)
+        yield from self._scan_dotfiles(home)
 
-    def _scan_config_dir(self) -> Iterator[ScannedEntry]:
-        config_dir = Path.home() / ".config"
+    def _scan_config_dir(self, home: str) -> Iterator[ScannedEntry]:
+        config_dir = os.path.join(home, ".config")
 
-        if not config_dir.is_dir():
+        if not os.path.isdir(config_dir):
             return
 
         try:
-            entries = sorted(config_dir.iterdir())
+            with os.scandir(config_dir) as it:
+                entries = sorted(entry.path for entry in it)
         except PermissionError:
             logger.warning("Permission denied scanning directory: %s", config_dir)
             return
 
-        for entry in entries:
-            try:
-                yield from self._process_entry(entry)
-            except PermissionError:
-                logger.warning("Permission denied accessing: %s", entry)
-                continue
+        # Each entry is stat + ownership lookup + size walk, all blocking on I/O;
+        # map() keeps the sorted order of the results.
+        with ThreadPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as pool:
+            for result in pool.map(self._classify_entry, entries):
+                if result is not None:
+                    yield result
 
-    def _scan_dotfiles(self) -> Iterator[ScannedEntry]:
-        home = Path.home()
+    def _scan_dotfiles(self, home: str) -> Iterator[ScannedEntry]:
+        # One directory read instead of an existence check per known dotfile;
+        # dead symlinks are listed too, so they still reach dead-link detection.
+        try:
+            with os.scandir(home) as entries:
+                present = {entry.name for entry in entries if entry.name in _SHELL_DOTFILES_SET}
+        except OSError as e:
+            logger.warning("Cannot list home directory %s: %s", home, e)
+            return
 
         for dotfile_name in _SHELL_DOTFILES:
-            dotfile = home / dotfile_name
-            if not dotfile.exists() and not dotfile.is_symlink():
+            if dotfile_name not in present:
                 continue
 
-            try:
-                yield from self._process_entry(dotfile)
-            except PermissionError:
-                logger.warning("Permission denied accessing: %s", dotfile)
-                continue
+            dotfile = os.path.join(home, dotfile_name)
+            result = self._classify_entry(dotfile)
+            if result is not None:
+                yield result
 
-    def _process_entry(self, entry: Path) -> Iterator[ScannedEntry]:
-        name = entry.name
-        path_str = str(entry)
+    def _classify_entry(self, entry: str) -> ScannedEntry | None:
+        try:
+            return self._process_entry(entry)
+        except PermissionError:
+            logger.warning("Permission denied accessing: %s", entry)
+            return None
 
-        if is_protected(path_str, "configs"):
-            return
+    def _process_entry(self, entry: str) -> ScannedEntry | None:
+        name = os.path.basename(entry)
+
+        if is_protected(entry, "configs"):
+            return None
+
+        # One lstat serves the symlink check, the path type, size and mtime.
+        try:
+            lstat = os.lstat(entry)
+        except FileNotFoundError:
+            return None  # vanished since the directory was listed
 
         # Detect dead symlinks before checking ownership
-        if entry.is_symlink() and not entry.exists():
-            yield ScannedEntry(
-                path=path_str,
+        if stat.S_ISLNK(lstat.st_mode) and not os.path.exists(entry):
+            return ScannedEntry(
+                path=entry,
                 path_type=PathType.DEAD_SYMLINK,
                 status=OrphanStatus.ORPHAN,
-                size_bytes=get_path_size(entry),
-                mtime=get_path_mtime(entry),
+                size_bytes=lstat.st_size,  # the link itself; there is no target to walk
+                mtime=get_path_mtime(entry, lstat),
                 parent_target=None,
                 orphan_reason=OrphanReason.DEAD_LINK,
                 confidence=_CONFIDENCE_FILE,
             )
-            return
 
-        path_type = classify_path_type(entry)
+        path_type = classify_path_type(entry, lstat)
         status = self._check_ownership(name, entry)
 
         if status != OrphanStatus.ORPHAN:
-            return
+            return None
 
         orphan_reason = OrphanReason.NO_PACKAGE_MATCH
         confidence = _CONFIDENCE_DIRECTORY if path_type == PathType.DIRECTORY else _CONFIDENCE_FILE
 
-        yield ScannedEntry(
-            path=path_str,
+        return ScannedEntry(
+            path=entry,
             path_type=path_type,
             status=OrphanStatus.ORPHAN,
-            size_bytes=get_path_size(entry),
-            mtime=get_path_mtime(entry),
+            size_bytes=get_path_size(entry, lstat),
+            mtime=get_path_mtime(entry, lstat),
             parent_target=None,
             orphan_reason=orphan_reason,
             confidence=confidence,
         )
 
-    def _check_ownership(self, name: str, path: Path) -> OrphanStatus:
-        """Checks: 1) dpkg -S, 2) flatpak/snap app name, 3) normalized name match."""
-        if dpkg_owns_path(path, self._dpkg_cache):
+    def _check_ownership(self, name: str, path: str) -> OrphanStatus:
+        """Checks: 1) dpkg file lists, 2) flatpak/snap app name, 3) normalized name match."""
+        if dpkg_owns_path(path, self._ensure_dpkg_owned()):
             return OrphanStatus.OWNED
 
-        apps = self._ensure_apps_cache()
-        if app_name_matches(name, apps):
+        if app_name_matches(name, self._ensure_app_index()):
             return OrphanStatus.OWNED
 
         if self._normalized_name_match(name):
@@ -147,25 +176,50 @@ class ConfigScanner:
         assert self._normalized_apps is not None
         return name_normalized in self._normalized_apps
 
+    def _ensure_dpkg_owned(self) -> frozenset[bytes]:
+        if self._dpkg_owned is None:
+            self._dpkg_owned = load_dpkg_owned_paths()
+        return self._dpkg_owned
+
     def _ensure_packages_cache(self) -> set[str]:
-        if self._packages_cache is None:
-            self._packages_cache = get_installed_packages()
-            self._normalized_packages = {
-                p.lower().replace(".", "").replace("-", "") for p in self._packages_cache
-            }
+        self._ensure_installed_caches()
+        assert self._packages_cache is not None
         return self._packages_cache
 
     def _ensure_apps_cache(self) -> set[str]:
-        if self._apps_cache is None:
-            self._apps_cache = get_installed_apps()
-            self._normalized_apps = {
-                a.lower().replace(".", "").replace("-", "") for a in self._apps_cache
-            }
+        self._ensure_installed_caches()
+        assert self._apps_cache is not None
         return self._apps_cache
 
+    def _ensure_app_index(self) -> frozenset[str]:
+        if self._app_index is None:
+            self._app_index = app_name_index(self._ensure_apps_cache())
+        return self._app_index
+
+    def _ensure_installed_caches(self) -> None:
+        """Probes apps and packages together so their subprocesses overlap."""
+        if self._apps_cache is not None and self._packages_cache is not None:
+            return
+        self._apps_cache, self._packages_cache = get_installed_apps_and_packages()
+        self._normalized_apps = {
+            a.lower().replace(".", "").replace("-", "") for a in self._apps_cache
+        }
+        self._normalized_packages = {
+            p.lower().replace(".", "").replace("-", "") for p in self._packages_cache
+        }
+
+    def _warm_caches(self) -> None:
+        """Runs every external lookup up front; per-entry work then only reads the caches.
+
+        This is also what makes the caches safe to share with the worker threads.
+        """
+        self._ensure_dpkg_owned()
+        self._ensure_app_index()
+
     def _reset_caches(self) -> None:
         self._packages_cache = None
         self._apps_cache = None
-        self._dpkg_cache = {}
+        self._dpkg_owned = None
         self._normalized_packages = None
         self._normalized_apps = None
+        self._app_index = None
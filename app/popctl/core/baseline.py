@@ -1,8 +1,10 @@
 import fnmatch
+import functools
+import re
 
 # Protected package name patterns (glob-style)
 # These patterns match critical system packages that should never be removed
-PROTECTED_PACKAGE_PATTERNS: list[str] = [
+PROTECTED_PACKAGE_PATTERNS: tuple[str, ...] = (
     # Kernel and boot
     "linux-*",
     "grub-*",
@@ -61,42 +63,54 @@ PROTECTED_PACKAGE_PATTERNS: list[str] = [
     # Display and session
     "gdm*",
     "plymouth*",
-]
+)
 
 
-# Explicitly protected package names (exact matches)
-PROTECTED_PACKAGES: set[str] = {
-    # Core utilities that must exist
-    "bash",
-    "coreutils",
-    "util-linux",
-    "sudo",
-    "passwd",
-    "login",
-    # Essential networking
-    "iproute2",
-    "netbase",
-    "hostname",
-    # Package management
-    "apt",
-    "dpkg",
-    "apt-utils",
-    # Init and services
-    "init",
-    "systemd",
-    "systemd-sysv",
-    # Snap infrastructure
-    "snapd",
-    "bare",
-}
+# Explicitly protected package names (exact matches). Both tables are immutable:
+# is_package_protected() memoizes its answers.
+PROTECTED_PACKAGES: frozenset[str] = frozenset(
+    {
+        # Core utilities that must exist
+        "bash",
+        "coreutils",
+        "util-linux",
+        "sudo",
+        "passwd",
+        "login",
+        # Essential networking
+        "iproute2",
+        "netbase",
+        "hostname",
+        # Package management
+        "apt",
+        "dpkg",
+        "apt-utils",
+        # Init and services
+        "init",
+        "systemd",
+        "systemd-sysv",
+        # Snap infrastructure
+        "snapd",
+        "bare",
+    }
+)
+
 
+# All globs joined into one alternation, translated once at import: a lookup
+# is a single regex match instead of one fnmatch call per pattern.
+_PROTECTED_PATTERN_RE = re.compile(
+    "|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in PROTECTED_PACKAGE_PATTERNS)
+)
 
+
+@functools.lru_cache(maxsize=4096)
 def is_package_protected(package_name: str) -> bool:
+    """Memoized: diff and manifest checks ask about the same names repeatedly."""
+    name = package_name.lower()
+
     # Check exact matches first (faster, case-insensitive)
-    if package_name.lower() in PROTECTED_PACKAGES:
+    if name in PROTECTED_PACKAGES:
         return True
 
     # Check pattern matches
-    return any(
-        fnmatch.fnmatch(package_name.lower(), pattern) for pattern in PROTECTED_PACKAGE_PATTERNS
-    )
+    return _PROTECTED_PATTERN_RE.match(name) is not None
@@ -300,22 +300,22 @@ def diff_to_actions(
     Returns:
         List of Action objects to execute.
     """
-    actions: list[Action] = []
-
-    # MISSING -> INSTALL
-    for entry in diff_result.missing:
-        actions.extend(_install_actions_for_entry(entry, sources))
-
-    # EXTRA -> REMOVE/PURGE
-    for entry in diff_result.extra:
-        # Purge applies to APT and Snap packages
-        use_purge = purge and entry.source in (PackageSource.APT, PackageSource.SNAP)
+    # MISSING -> INSTALL (one entry may expand to several source-specific installs)
+    actions = [
+        action
+        for entry in diff_result.missing
+        for action in _install_actions_for_entry(entry, sources)
+    ]
 
-        action = Action(
-            action_type=ActionType.PURGE if use_purge else ActionType.REMOVE,
+    # EXTRA -> REMOVE/PURGE; purge applies to APT and Snap packages
+    purge_sources = (PackageSource.APT, PackageSource.SNAP) if purge else ()
+    actions += [
+        Action(
+            action_type=ActionType.PURGE if entry.source in purge_sources else ActionType.REMOVE,
             package=entry.name,
             source=entry.source,
         )
-        actions.append(action)
+        for entry in diff_result.extra
+    ]
 
     return actions
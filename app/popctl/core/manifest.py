@@ -66,6 +66,11 @@ def load_manifest(path: Path | None = None) -> Manifest:
         raise ManifestValidationError(f"Invalid manifest content: {e}") from e
 
 
+def dump_manifest(manifest: Manifest) -> str:
+    """Serialize a manifest to its TOML text without touching the filesystem."""
+    return tomli_w.dumps(manifest.model_dump(mode="json", exclude_none=True))
+
+
 def save_manifest(manifest: Manifest, path: Path | None = None) -> Path:
     """Save a manifest to a TOML file.
 
@@ -88,8 +93,7 @@ def save_manifest(manifest: Manifest, path: Path | None = None) -> Path:
     # Ensure parent directory exists
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Convert manifest to dictionary with proper serialization
-    data = manifest.model_dump(mode="json", exclude_none=True)
+    content = dump_manifest(manifest).encode("utf-8")
 
     tmp_path: Path | None = None
     try:
@@ -101,7 +105,7 @@ def save_manifest(manifest: Manifest, path: Path | None = None) -> Path:
             suffix=".tmp",
         ) as f:
             tmp_path = Path(f.name)
-            tomli_w.dump(data, f)
+            f.write(content)
         # os.replace() is atomic on POSIX (same filesystem guaranteed by temp file in same dir)
         os.replace(str(tmp_path), str(manifest_path))
     except OSError as e:
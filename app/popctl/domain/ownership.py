@@ -1,4 +1,7 @@
 import logging
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -8,28 +11,56 @@ from popctl.utils.shell import run_command
 logger = logging.getLogger(__name__)
 
 
-def classify_path_type(path: Path) -> PathType:
-    """Falls back to FILE for special files (sockets, FIFOs, device nodes)."""
-    if path.is_symlink():
-        return PathType.DEAD_SYMLINK if not path.exists() else PathType.SYMLINK
-    if path.is_dir():
+def classify_path_type(path: str | Path, lstat: os.stat_result | None = None) -> PathType:
+    """Falls back to FILE for special files (sockets, FIFOs, device nodes).
+
+    Branches on the mode bits of a single lstat (the caller's, if given); only
+    symlinks need a second stat, to tell live links from dead ones.
+    """
+    mode = (lstat if lstat is not None else os.lstat(path)).st_mode
+    if stat.S_ISLNK(mode):
+        return PathType.DEAD_SYMLINK if not os.path.exists(path) else PathType.SYMLINK
+    if stat.S_ISDIR(mode):
         return PathType.DIRECTORY
     return PathType.FILE
 
 
-def dpkg_owns_path(path: Path, cache: dict[str, bool]) -> bool:
-    path_str = str(path)
-    if path_str in cache:
-        return cache[path_str]
+# Bounds the size walk so huge caches (browser profiles, IDE state) can't dominate
+# scan time; past this many entries the size is reported as unknown.
+SIZE_ENTRY_CAP = 50_000
+
+# dpkg keeps one "<package>.list" file per installed package naming every path it owns.
+DPKG_INFO_DIR = Path("/var/lib/dpkg/info")
+
 
+def load_dpkg_owned_paths() -> frozenset[bytes]:
+    """Read every dpkg file list once instead of forking `dpkg -S` per path.
+
+    Paths stay raw bytes: the lists are read in binary and never decoded.
+    """
+    owned: set[bytes] = set()
     try:
-        result = run_command(["dpkg", "-S", path_str], timeout=10.0)
-        owned = result.success
-    except (FileNotFoundError, OSError):
-        owned = False
+        with os.scandir(DPKG_INFO_DIR) as entries:
+            list_files = [entry.path for entry in entries if entry.name.endswith(".list")]
+    except FileNotFoundError:
+        return frozenset()  # not a dpkg-based system
+    except OSError as exc:
+        logger.warning("Cannot read dpkg database — ownership checks will be incomplete: %s", exc)
+        return frozenset()
+
+    for list_file in list_files:
+        try:
+            with open(list_file, "rb") as f:
+                owned.update(f.read().splitlines())
+        except OSError as exc:
+            logger.debug("Skipping unreadable dpkg file list %s: %s", list_file, exc)
+
+    owned.discard(b"")
+    return frozenset(owned)
 
-    cache[path_str] = owned
-    return owned
+
+def dpkg_owns_path(path: str | Path, owned_paths: frozenset[bytes]) -> bool:
+    return os.fsencode(path) in owned_paths
 
 
 def get_installed_packages() -> set[str]:
@@ -50,79 +81,125 @@ def get_installed_packages() -> set[str]:
     return set()
 
 
-def get_installed_apps() -> set[str]:
-    apps: set[str] = set()
-
-    # Flatpak apps
+def _get_flatpak_apps() -> set[str]:
     try:
         result = run_command(
             ["flatpak", "list", "--app", "--columns=application"],
             timeout=15.0,
         )
         if result.success:
-            apps.update(line.strip() for line in result.stdout.strip().split("\n") if line.strip())
+            return {line.strip() for line in result.stdout.strip().split("\n") if line.strip()}
     except (FileNotFoundError, OSError) as exc:
         logger.warning("flatpak not available: %s", exc)
 
-    # Snap apps
+    return set()
+
+
+def _get_snap_apps() -> set[str]:
+    apps: set[str] = set()
     try:
         result = run_command(["snap", "list"], timeout=15.0)
         if result.success:
-            lines = result.stdout.strip().split("\n")
-            # Skip header line
-            for line in lines[1:]:
-                parts = line.split()
-                if parts:
-                    apps.add(parts[0])
+            # Skip header line; the snap name is the first column
+            for line in result.stdout.strip().splitlines()[1:]:
+                name = line.lstrip().partition(" ")[0]
+                if name:
+                    apps.add(name)
     except (FileNotFoundError, OSError) as exc:
         logger.warning("snap not available: %s", exc)
 
     return apps
 
 
-def app_name_matches(name: str, apps: set[str]) -> bool:
-    """Case-insensitive match including reverse-DNS component matching.
+def get_installed_apps() -> set[str]:
+    """Flatpak and snap apps; both probes run concurrently."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        flatpak = pool.submit(_get_flatpak_apps)
+        snap = pool.submit(_get_snap_apps)
+        return flatpak.result() | snap.result()
+
+
+def get_installed_apps_and_packages() -> tuple[set[str], set[str]]:
+    """Returns (apps, packages); the flatpak, snap and dpkg-query probes run concurrently."""
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        flatpak = pool.submit(_get_flatpak_apps)
+        snap = pool.submit(_get_snap_apps)
+        packages = pool.submit(get_installed_packages)
+        return flatpak.result() | snap.result(), packages.result()
 
-    E.g. "firefox" matches "org.mozilla.firefox".
-    """
-    name_lower = name.lower()
 
+def app_name_index(apps: set[str]) -> frozenset[str]:
+    """Lowercased app IDs plus each of their reverse-DNS components."""
+    index: set[str] = set()
     for app in apps:
         app_lower = app.lower()
-        # Exact match
-        if name_lower == app_lower:
-            return True
-        # Reverse-DNS component match (e.g., "firefox" in "org.mozilla.firefox")
-        if "." in app_lower and name_lower in app_lower.split("."):
-            return True
+        index.add(app_lower)
+        index.update(app_lower.split("."))
+    return frozenset(index)
 
-    return False
 
+def app_name_matches(name: str, app_index: frozenset[str]) -> bool:
+    """Case-insensitive match including reverse-DNS component matching.
+
+    E.g. "firefox" matches "org.mozilla.firefox". Takes an app_name_index().
+    """
+    return name.lower() in app_index
 
-def get_path_size(path: Path) -> int | None:
-    try:
-        if path.is_file() or path.is_symlink():
-            return path.lstat().st_size
-
-        if path.is_dir():
-            total = 0
-            for child in path.rglob("*"):
-                try:
-                    if child.is_file():
-                        total += child.stat().st_size
-                except OSError:
-                    continue
-            return total
-
-        return None  # special file (socket, FIFO, device node)
-    except OSError:
-        return None
 
+def get_path_size(
+    path: str | Path,
+    lstat: os.stat_result | None = None,
+    *,
+    entry_cap: int = SIZE_ENTRY_CAP,
+) -> int | None:
+    """Files and symlinks report their own size, directories the sum of their files.
 
-def get_path_mtime(path: Path) -> str | None:
+    Pass an lstat result the caller already holds to skip the syscall. Directories
+    holding more than entry_cap entries report None (unknown) rather than walking on.
+    """
+    if lstat is None:
+        try:
+            lstat = os.lstat(path)
+        except OSError:
+            return None
+
+    mode = lstat.st_mode
+    if stat.S_ISREG(mode) or stat.S_ISLNK(mode):
+        return lstat.st_size
+    if stat.S_ISDIR(mode):
+        return _directory_size(os.fspath(path), entry_cap)
+    return None  # special file (socket, FIFO, device node)
+
+
+def _directory_size(root: str, entry_cap: int) -> int | None:
+    """Sums regular files below root; os.scandir reuses the directory read for type checks."""
+    total = 0
+    seen = 0
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    seen += 1
+                    if seen > entry_cap:
+                        return None
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            total += entry.stat().st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def get_path_mtime(path: str | Path, lstat: os.stat_result | None = None) -> str | None:
+    """Pass an lstat result the caller already holds to skip the syscall."""
     try:
-        stat = path.lstat()
-        dt = datetime.fromtimestamp(stat.st_mtime, tz=UTC)
+        st = lstat if lstat is not None else os.lstat(path)
+        dt = datetime.fromtimestamp(st.st_mtime, tz=UTC)
         return dt.isoformat()
     except OSError:
         return None
@@ -1,4 +1,6 @@
 import fnmatch
+import functools
+import re
 from pathlib import Path
 from typing import Literal
 
@@ -88,14 +90,16 @@ PROTECTED_PATTERNS: dict[str, tuple[str, ...]] = {
 }
 
 
-def is_protected(path: str, domain: Literal["filesystem", "configs"]) -> bool:
-    """Patterns use ~ notation, expanded to the real home dir before fnmatch."""
-    home = str(Path.home())
-
-    for pattern in PROTECTED_PATTERNS[domain]:
-        expanded = home + pattern[1:] if pattern.startswith("~") else pattern
+@functools.cache
+def _compile_patterns(domain: Literal["filesystem", "configs"], home: str) -> re.Pattern[str]:
+    """Fold a domain's patterns into one alternation, keyed on home so it follows HOME changes."""
+    translated = (
+        fnmatch.translate(home + pattern[1:] if pattern.startswith("~") else pattern)
+        for pattern in PROTECTED_PATTERNS[domain]
+    )
+    return re.compile("|".join(f"(?:{regex})" for regex in translated))
 
-        if fnmatch.fnmatch(path, expanded):
-            return True
 
-    return False
+def is_protected(path: str, domain: Literal["filesystem", "configs"]) -> bool:
+    """Patterns use ~ notation, expanded to the real home dir before matching."""
+    return _compile_patterns(domain, str(Path.home())).match(path) is not None
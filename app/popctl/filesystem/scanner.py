@@ -4,12 +4,14 @@ from pathlib import Path
 
 from popctl.domain.models import OrphanReason, OrphanStatus, PathType, ScannedEntry
 from popctl.domain.ownership import (
+    app_name_index,
     app_name_matches,
     classify_path_type,
     dpkg_owns_path,
     get_installed_apps,
     get_path_mtime,
     get_path_size,
+    load_dpkg_owned_paths,
 )
 from popctl.domain.protected import is_protected
 
@@ -44,13 +46,13 @@ class FilesystemScanner:
             self._targets = (*default, Path(_ETC_TARGET)) if include_etc else default
 
         # Caches (populated lazily, valid for one scan session)
-        self._installed_apps: set[str] | None = None
-        self._dpkg_cache: dict[str, bool] = {}
+        self._app_index: frozenset[str] | None = None
+        self._dpkg_owned: frozenset[bytes] | None = None
 
     def scan(self) -> Iterator[ScannedEntry]:
         # Reset caches for each scan session
-        self._installed_apps = None
-        self._dpkg_cache = {}
+        self._app_index = None
+        self._dpkg_owned = None
 
         for target in self._targets:
             if not target.is_dir():
@@ -65,8 +67,10 @@ class FilesystemScanner:
             return
 
         for entry in entries:
+            # One lstat per entry feeds the type, size and mtime below.
             try:
-                path_type = classify_path_type(entry)
+                lstat = entry.lstat()
+                path_type = classify_path_type(entry, lstat)
             except OSError:
                 logger.warning("Cannot determine type of: %s", entry)
                 continue
@@ -84,8 +88,8 @@ class FilesystemScanner:
             # Determine orphan reason
             orphan_reason = self._determine_orphan_reason(path_type, target)
             confidence = self._calculate_confidence(str(target))
-            size = get_path_size(entry)
-            mtime = get_path_mtime(entry)
+            size = get_path_size(entry, lstat)
+            mtime = get_path_mtime(entry, lstat)
 
             # Build parent_target as tilde-prefixed path for home dirs
             parent_target = self._format_target(target)
@@ -102,23 +106,27 @@ class FilesystemScanner:
             )
 
     def _check_ownership(self, name: str, path: Path) -> OrphanStatus:
-        """Checks: 1) protected list, 2) dpkg -S, 3) flatpak/snap app name."""
+        """Checks: 1) protected list, 2) dpkg file lists, 3) flatpak/snap app name."""
         if is_protected(str(path), "filesystem"):
             return OrphanStatus.PROTECTED
 
-        if dpkg_owns_path(path, self._dpkg_cache):
+        if dpkg_owns_path(path, self._ensure_dpkg_owned()):
             return OrphanStatus.OWNED
 
-        apps = self._ensure_apps_cache()
-        if app_name_matches(name, apps):
+        if app_name_matches(name, self._ensure_app_index()):
             return OrphanStatus.OWNED
 
         return OrphanStatus.ORPHAN
 
-    def _ensure_apps_cache(self) -> set[str]:
-        if self._installed_apps is None:
-            self._installed_apps = get_installed_apps()
-        return self._installed_apps
+    def _ensure_app_index(self) -> frozenset[str]:
+        if self._app_index is None:
+            self._app_index = app_name_index(get_installed_apps())
+        return self._app_index
+
+    def _ensure_dpkg_owned(self) -> frozenset[bytes]:
+        if self._dpkg_owned is None:
+            self._dpkg_owned = load_dpkg_owned_paths()
+        return self._dpkg_owned
 
     def _calculate_confidence(self, target: str) -> float:
         """Higher confidence = safer to delete. .cache highest, /etc lowest."""
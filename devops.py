@@ -33,7 +33,7 @@ def test() -> None:
     _run(
         [
             ["echo", "🧪 [Native Task] Testing with PyTest...\n"],
-            ["uv", "run", "pytest", "-q"],
+            ["uv", "run", "pytest", "-q", "-n", "auto", "--dist=loadfile"],
             ["echo", "\n🟢 Test Coverage → ✅ Test coverage sufficient"],
         ]
     )
@@ -29,6 +29,9 @@ def pytest_configure(config: pytest.Config) -> None:
     os.environ["HOME"] = str(home_dir)
     os.environ["XDG_CONFIG_HOME"] = str(config_dir)
     os.environ["XDG_STATE_HOME"] = str(state_dir)
+    # Module-level Rich consoles read COLUMNS once at import; pytest-xdist workers
+    # inherit the controller's terminal width, so pin it before collection too.
+    os.environ["COLUMNS"] = "200"
 
     config.add_cleanup(lambda: shutil.rmtree(session_dir, ignore_errors=True))
 
@@ -53,7 +56,7 @@ def _isolate_user_state(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None
 
 
 @pytest.fixture(autouse=True)
-def _no_real_system_commands(monkeypatch: pytest.MonkeyPatch) -> None:
+def _no_real_system_commands(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     """Refuse any real system-command execution from unit tests.
 
     An unmocked test could otherwise execute a host binary, including an agent
@@ -72,6 +75,8 @@ def _no_real_system_commands(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr("popctl.scanners.snap.command_exists", lambda _cmd: False)
 
     monkeypatch.setattr("popctl.domain.ownership.run_command", _refuse)
+    # The host dpkg database is system state too: ownership sees an empty one.
+    monkeypatch.setattr("popctl.domain.ownership.DPKG_INFO_DIR", tmp_path / "dpkg-info")
     monkeypatch.setattr("popctl.alerts.notifier.run_command", _refuse)
     monkeypatch.setattr("popctl.scanners.flatpak.run_command", _refuse)
     monkeypatch.setattr("popctl.scanners.apt.run_command", _refuse)
@@ -0,0 +1,43 @@
+"""Benchmarks for diff_to_actions in core/diff.py.
+
+Run with timing: uv run pytest tests/perf --benchmark-enable --benchmark-only --no-cov
+"""
+
+from popctl.core.diff import DiffEntry, DiffResult, DiffType, diff_to_actions
+from popctl.models.action import ActionType
+from popctl.models.package import PackageSource
+from pytest_benchmark.fixture import BenchmarkFixture
+
+_ENTRY_COUNT = 10_000
+
+
+def _extra_diff(sources: tuple[PackageSource, ...]) -> DiffResult:
+    """Create a diff of _ENTRY_COUNT EXTRA entries, cycling through sources."""
+    return DiffResult(
+        new=(),
+        missing=(),
+        extra=tuple(
+            DiffEntry(name=f"pkg{i}", source=sources[i % len(sources)], diff_type=DiffType.EXTRA)
+            for i in range(_ENTRY_COUNT)
+        ),
+    )
+
+
+def test_diff_to_actions_large_apt(benchmark: BenchmarkFixture) -> None:
+    """10k APT removals with purge."""
+    diff_result = _extra_diff((PackageSource.APT,))
+
+    actions = benchmark(diff_to_actions, diff_result, purge=True)
+
+    assert len(actions) == _ENTRY_COUNT
+    assert all(a.action_type == ActionType.PURGE for a in actions)
+
+
+def test_diff_to_actions_large_mixed_sources(benchmark: BenchmarkFixture) -> None:
+    """10k removals spread over APT, flatpak and snap, exercising the per-source purge branch."""
+    diff_result = _extra_diff((PackageSource.APT, PackageSource.FLATPAK, PackageSource.SNAP))
+
+    actions = benchmark(diff_to_actions, diff_result, purge=True)
+
+    assert len(actions) == _ENTRY_COUNT
+    assert sum(a.action_type == ActionType.REMOVE for a in actions) == _ENTRY_COUNT // 3
@@ -4,6 +4,7 @@ Tests for the CLI init command implementation.
 """
 
 import os
+import tomllib
 from collections.abc import Iterator
 from datetime import UTC, datetime
 from pathlib import Path
@@ -149,8 +150,6 @@ installed\tapt-utils\t2.7\t10000\tPackage manager utilities"""
         assert result.exit_code == 0
 
         # Read and check manifest content - check packages.keep section
-        import tomllib
-
         with open(manifest_path, "rb") as f:
             data = tomllib.load(f)
 
@@ -421,8 +420,6 @@ class TestInitManifestContent:
 
     def test_manifest_has_correct_structure(self, tmp_path: Path, mock_apt_packages: str) -> None:
         """Generated manifest has correct TOML structure."""
-        import tomllib
-
         manifest_path = tmp_path / "manifest.toml"
 
         with (
@@ -460,8 +457,6 @@ class TestInitManifestContent:
         self, tmp_path: Path, mock_apt_packages: str, mock_flatpak_packages: str
     ) -> None:
         """Package entries have correct source attribute."""
-        import tomllib
-
         manifest_path = tmp_path / "manifest.toml"
 
         with (
@@ -126,8 +126,8 @@ class TestConfigOperator:
         config_file = home / ".old_config"
         config_file.write_text("content")
 
+        # Dry-run never writes backups, so the backup base is left uncreated.
         backup_base = tmp_path / "backups"
-        backup_base.mkdir()
 
         with (
             patch("popctl.configs.operator.Path.home", return_value=home),
@@ -145,9 +145,10 @@ class TestConfigOperator:
             assert result.dry_run is True
             assert result.error is None
 
-        # Nothing should be deleted
+        # Nothing should be deleted or backed up
         assert config_dir.exists()
         assert config_file.exists()
+        assert not backup_base.exists()
 
     def test_delete_backup_failure_aborts_deletion(self, tmp_path: Path) -> None:
         """Backup failure aborts deletion to preserve the original."""
@@ -221,13 +222,21 @@ class TestConfigOperator:
         backup_base = tmp_path / "backups"
         backup_base.mkdir()
 
+        real_unlink = Path.unlink
+
+        def deny_target_unlink(self: Path, missing_ok: bool = False) -> None:
+            # Fail only for the config under test; every other unlink stays real.
+            if self == config_file:
+                raise OSError("Permission denied")
+            real_unlink(self, missing_ok=missing_ok)
+
         with (
             patch("popctl.configs.operator.Path.home", return_value=home),
             patch(
                 "popctl.configs.operator.ensure_dir",
                 return_value=backup_base,
             ),
-            patch.object(Path, "unlink", side_effect=OSError("Permission denied")),
+            patch.object(Path, "unlink", deny_target_unlink),
         ):
             op = ConfigOperator(dry_run=False)
             results = op.delete([str(config_file)])
@@ -236,6 +245,7 @@ class TestConfigOperator:
         assert results[0].success is False
         assert results[0].error is not None
         assert "Permission denied" in results[0].error
+        assert config_file.exists()
 
     def test_delete_tilde_path_expanded(
         self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
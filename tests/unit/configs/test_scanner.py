@@ -9,16 +9,6 @@ from popctl.domain.ownership import classify_path_type
 from popctl.utils.shell import CommandResult
 
 
-def _dpkg_not_found(*_args: object, **_kwargs: object) -> CommandResult:
-    """Simulate dpkg -S returning 'not found' (package does not own path)."""
-    return CommandResult(stdout="", stderr="dpkg-query: no path found", returncode=1)
-
-
-def _dpkg_found(*_args: object, **_kwargs: object) -> CommandResult:
-    """Simulate dpkg -S returning success (package owns path)."""
-    return CommandResult(stdout="some-package: /path", stderr="", returncode=0)
-
-
 def _no_apps(*_args: object, **_kwargs: object) -> CommandResult:
     """Simulate flatpak/snap/dpkg-query returning no apps."""
     return CommandResult(stdout="", stderr="", returncode=1)
@@ -48,8 +38,6 @@ def _snap_apps() -> CommandResult:
 def _route_command(args: list[str], **_kwargs: object) -> CommandResult:
     """Route mock commands based on the command being called."""
     cmd = args[0] if args else ""
-    if cmd == "dpkg":
-        return _dpkg_not_found()
     if cmd == "flatpak":
         return _flatpak_apps()
     if cmd == "snap":
@@ -66,8 +54,6 @@ def _route_command(args: list[str], **_kwargs: object) -> CommandResult:
 def _route_command_no_apps(args: list[str], **_kwargs: object) -> CommandResult:
     """Route commands but all external tools return nothing."""
     cmd = args[0] if args else ""
-    if cmd == "dpkg":
-        return _dpkg_not_found()
     if cmd in ("flatpak", "snap", "dpkg-query"):
         return _no_apps()
     return CommandResult(stdout="", stderr="", returncode=1)
@@ -175,13 +161,12 @@ class TestScanSkipsOwnedPackages:
         owned_dir = config_dir / "vim"
         owned_dir.mkdir()
 
-        def route(args: list[str], **_kw: object) -> CommandResult:
-            if args[0] == "dpkg" and args[1] == "-S":
-                return _dpkg_found()
-            return _no_apps()
-
         with (
-            patch("popctl.domain.ownership.run_command", side_effect=route),
+            patch("popctl.domain.ownership.run_command", side_effect=_no_apps),
+            patch(
+                "popctl.configs.scanner.load_dpkg_owned_paths",
+                return_value=frozenset({bytes(owned_dir)}),
+            ),
             patch("popctl.configs.scanner.Path.home", return_value=tmp_path),
         ):
             scanner = ConfigScanner()
@@ -439,6 +424,7 @@ class TestDeadSymlinkDetection:
         assert results[0].path_type == PathType.DEAD_SYMLINK
         assert results[0].orphan_reason == OrphanReason.DEAD_LINK
         assert results[0].status == OrphanStatus.ORPHAN
+        assert results[0].size_bytes == dead_link.lstat().st_size
 
     @patch("popctl.domain.ownership.run_command", side_effect=_route_command_no_apps)
     @patch("popctl.configs.scanner.is_protected", return_value=False)
@@ -475,32 +461,25 @@ class TestCachesResetPerScan:
         config_dir.mkdir()
         (config_dir / "app1").mkdir()
 
-        dpkg_call_count = 0
-
-        def counting_route(args: list[str], **_kw: object) -> CommandResult:
-            nonlocal dpkg_call_count
-            if args[0] == "dpkg":
-                dpkg_call_count += 1
-                return _dpkg_not_found()
-            return _no_apps()
-
         with (
-            patch("popctl.domain.ownership.run_command", side_effect=counting_route),
+            patch("popctl.domain.ownership.run_command", side_effect=_no_apps),
+            patch(
+                "popctl.configs.scanner.load_dpkg_owned_paths", return_value=frozenset()
+            ) as mock_load,
             patch("popctl.configs.scanner.Path.home", return_value=tmp_path),
         ):
             scanner = ConfigScanner()
 
             # First scan populates caches
             list(scanner.scan())
-            first_count = dpkg_call_count
+            first_count = mock_load.call_count
 
-            # Second scan should reset caches and re-query
+            # Second scan should reset caches and re-read the dpkg database
             list(scanner.scan())
-            second_count = dpkg_call_count - first_count
+            second_count = mock_load.call_count - first_count
 
-        # Both scans should call dpkg the same number of times
-        assert first_count == second_count
-        assert first_count > 0
+        # Each scan reads the dpkg database exactly once
+        assert first_count == second_count == 1
 
 
 class TestGetPathType:
@@ -580,3 +559,24 @@ class TestScanIntegration:
         assert str(config_dir / "app1") in paths
         assert str(config_dir / "app2") in paths
         assert str(tmp_path / ".wgetrc") in paths
+
+    @patch("popctl.domain.ownership.run_command", side_effect=_route_command_no_apps)
+    @patch("popctl.configs.scanner.is_protected", return_value=False)
+    def test_scan_keeps_sorted_order(
+        self,
+        _mock_protected: object,
+        _mock_cmd: object,
+        tmp_path: Path,
+    ) -> None:
+        """Concurrent classification still yields ~/.config/ entries in sorted order."""
+        config_dir = tmp_path / ".config"
+        config_dir.mkdir()
+        names = [f"app{i:02d}" for i in range(40)]
+        for name in reversed(names):
+            (config_dir / name).mkdir()
+
+        with patch("popctl.configs.scanner.Path.home", return_value=tmp_path):
+            scanner = ConfigScanner()
+            results = list(scanner.scan())
+
+        assert [Path(r.path).name for r in results] == names
@@ -14,16 +14,19 @@ from popctl.models.manifest import (
 
 _ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
 
+# Fixed timestamp so manifest fixtures are deterministic and cacheable.
+_FIXED_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
 
 def strip_ansi(text: str) -> str:
     """Remove ANSI escape codes from text."""
     return _ANSI_RE.sub("", text)
 
 
-@pytest.fixture
-def sample_manifest() -> Manifest:
-    """Create a sample manifest for testing."""
-    now = datetime.now(UTC)
+@pytest.fixture(scope="session")
+def _sample_manifest_template() -> Manifest:
+    """Validate the sample manifest once per session."""
+    now = _FIXED_NOW
     return Manifest(
         meta=ManifestMeta(created=now, updated=now),
         system=SystemConfig(name="test-machine"),
@@ -38,3 +41,12 @@ def sample_manifest() -> Manifest:
             },
         ),
     )
+
+
+@pytest.fixture
+def sample_manifest(_sample_manifest_template: Manifest) -> Manifest:
+    """Create a sample manifest for testing.
+
+    Each test gets its own deep copy, so CLI tests may mutate it freely.
+    """
+    return _sample_manifest_template.model_copy(deep=True)
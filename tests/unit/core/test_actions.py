@@ -3,6 +3,7 @@
 Tests for diff-to-action conversion and source mapping logic.
 """
 
+import pytest
 from popctl.core.diff import DiffEntry, DiffResult, DiffType, diff_to_actions
 from popctl.models.action import ActionType
 from popctl.models.package import PackageSource
@@ -19,20 +20,52 @@ from popctl.sources.models import (
     SourcesConfig,
 )
 
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _make_entry(
+    name: str,
+    diff_type: DiffType,
+    source: PackageSource = PackageSource.APT,
+    version: str | None = None,
+) -> DiffEntry:
+    """Create a test DiffEntry."""
+    return DiffEntry(name=name, source=source, diff_type=diff_type, version=version)
+
+
+def _make_diff(
+    *,
+    new: tuple[DiffEntry, ...] = (),
+    missing: tuple[DiffEntry, ...] = (),
+    extra: tuple[DiffEntry, ...] = (),
+) -> DiffResult:
+    """Create a test DiffResult; omitted buckets are empty."""
+    return DiffResult(new=new, missing=missing, extra=extra)
+
+
+# Entries reused across tests; DiffEntry is frozen, so sharing them is safe.
+_VIM_MISSING = _make_entry("vim", DiffType.MISSING)
+_HTOP_NEW = _make_entry("htop", DiffType.NEW)
+_BLOATWARE_EXTRA = _make_entry("bloatware", DiffType.EXTRA)
+_FLATPAK_EXTRA = _make_entry("com.unwanted.App", DiffType.EXTRA, PackageSource.FLATPAK)
+_SNAP_EXTRA = _make_entry("telegram-desktop", DiffType.EXTRA, PackageSource.SNAP)
+
+
+# DiffResult and DiffEntry are frozen, so one instance can serve the whole module.
+@pytest.fixture(scope="module")
+def empty_diff() -> DiffResult:
+    """Create a diff with no changes."""
+    return _make_diff()
+
 
 class TestDiffToActionsMissing:
     """Tests for MISSING entries in diff_to_actions()."""
 
     def test_diff_to_actions_missing_creates_install(self) -> None:
         """MISSING entries produce INSTALL actions."""
-        diff_result = DiffResult(
-            new=(),
-            missing=(
-                DiffEntry(name="vim", source=PackageSource.APT, diff_type=DiffType.MISSING),
-                DiffEntry(name="git", source=PackageSource.APT, diff_type=DiffType.MISSING),
-            ),
-            extra=(),
-        )
+        diff_result = _make_diff(missing=(_VIM_MISSING, _make_entry("git", DiffType.MISSING)))
 
         actions = diff_to_actions(diff_result)
 
@@ -45,16 +78,8 @@ class TestDiffToActionsMissing:
 
     def test_diff_to_actions_missing_flatpak_creates_install(self) -> None:
         """MISSING flatpak entries produce INSTALL actions with FLATPAK source."""
-        diff_result = DiffResult(
-            new=(),
-            missing=(
-                DiffEntry(
-                    name="com.spotify.Client",
-                    source=PackageSource.FLATPAK,
-                    diff_type=DiffType.MISSING,
-                ),
-            ),
-            extra=(),
+        diff_result = _make_diff(
+            missing=(_make_entry("com.spotify.Client", DiffType.MISSING, PackageSource.FLATPAK),)
         )
 
         actions = diff_to_actions(diff_result)
@@ -70,18 +95,7 @@ class TestDiffToActionsExtra:
 
     def test_diff_to_actions_extra_creates_remove(self) -> None:
         """EXTRA entries produce REMOVE actions."""
-        diff_result = DiffResult(
-            new=(),
-            missing=(),
-            extra=(
-                DiffEntry(
-                    name="bloatware",
-                    source=PackageSource.APT,
-                    diff_type=DiffType.EXTRA,
-                    version="1.0",
-                ),
-            ),
-        )
+        diff_result = _make_diff(extra=(_make_entry("bloatware", DiffType.EXTRA, version="1.0"),))
 
         actions = diff_to_actions(diff_result)
 
@@ -92,17 +106,7 @@ class TestDiffToActionsExtra:
 
     def test_diff_to_actions_extra_flatpak_creates_remove(self) -> None:
         """EXTRA flatpak entries produce REMOVE actions with FLATPAK source."""
-        diff_result = DiffResult(
-            new=(),
-            missing=(),
-            extra=(
-                DiffEntry(
-                    name="com.unwanted.App",
-                    source=PackageSource.FLATPAK,
-                    diff_type=DiffType.EXTRA,
-                ),
-            ),
-        )
+        diff_result = _make_diff(extra=(_FLATPAK_EXTRA,))
 
         actions = diff_to_actions(diff_result)
 
@@ -114,135 +118,56 @@ class TestDiffToActionsExtra:
 class TestDiffToActionsPurge:
     """Tests for purge behavior in diff_to_actions()."""
 
-    def test_diff_to_actions_purge_for_apt(self) -> None:
-        """purge=True produces PURGE actions for APT packages."""
-        diff_result = DiffResult(
-            new=(),
-            missing=(),
-            extra=(
-                DiffEntry(name="bloatware", source=PackageSource.APT, diff_type=DiffType.EXTRA),
-            ),
-        )
-
-        actions = diff_to_actions(diff_result, purge=True)
-
-        assert len(actions) == 1
-        assert actions[0].action_type == ActionType.PURGE
-        assert actions[0].source == PackageSource.APT
-
-    def test_diff_to_actions_purge_ignored_for_flatpak(self) -> None:
-        """purge=True still produces REMOVE for flatpak packages."""
-        diff_result = DiffResult(
-            new=(),
-            missing=(),
-            extra=(
-                DiffEntry(
-                    name="com.unwanted.App",
-                    source=PackageSource.FLATPAK,
-                    diff_type=DiffType.EXTRA,
-                ),
-            ),
-        )
-
-        actions = diff_to_actions(diff_result, purge=True)
-
-        assert len(actions) == 1
-        assert actions[0].action_type == ActionType.REMOVE
-        assert actions[0].source == PackageSource.FLATPAK
-
-    def test_diff_to_actions_purge_for_snap(self) -> None:
-        """purge=True produces PURGE actions for Snap packages."""
-        diff_result = DiffResult(
-            new=(),
-            missing=(),
-            extra=(
-                DiffEntry(
-                    name="telegram-desktop", source=PackageSource.SNAP, diff_type=DiffType.EXTRA,
-                ),
-            ),
-        )
+    @pytest.mark.parametrize(
+        ("name", "source", "expected"),
+        [
+            ("bloatware", PackageSource.APT, ActionType.PURGE),
+            ("com.unwanted.App", PackageSource.FLATPAK, ActionType.REMOVE),
+            ("telegram-desktop", PackageSource.SNAP, ActionType.PURGE),
+        ],
+        ids=["apt", "flatpak", "snap"],
+    )
+    def test_diff_to_actions_purge_by_source(
+        self, name: str, source: PackageSource, expected: ActionType
+    ) -> None:
+        """purge=True produces PURGE for APT and Snap; flatpak has no purge and stays REMOVE."""
+        diff_result = _make_diff(extra=(_make_entry(name, DiffType.EXTRA, source),))
 
         actions = diff_to_actions(diff_result, purge=True)
 
         assert len(actions) == 1
-        assert actions[0].action_type == ActionType.PURGE
-        assert actions[0].source == PackageSource.SNAP
+        assert actions[0].action_type == expected
+        assert actions[0].source == source
 
     def test_diff_to_actions_purge_mixed_sources(self) -> None:
         """purge=True: APT gets PURGE, flatpak gets REMOVE, snap gets PURGE."""
-        diff_result = DiffResult(
-            new=(),
-            missing=(),
-            extra=(
-                DiffEntry(name="bloatware", source=PackageSource.APT, diff_type=DiffType.EXTRA),
-                DiffEntry(
-                    name="com.unwanted.App",
-                    source=PackageSource.FLATPAK,
-                    diff_type=DiffType.EXTRA,
-                ),
-                DiffEntry(
-                    name="telegram-desktop",
-                    source=PackageSource.SNAP,
-                    diff_type=DiffType.EXTRA,
-                ),
-            ),
-        )
+        diff_result = _make_diff(extra=(_BLOATWARE_EXTRA, _FLATPAK_EXTRA, _SNAP_EXTRA))
 
         actions = diff_to_actions(diff_result, purge=True)
 
         assert len(actions) == 3
-        apt_action = next(a for a in actions if a.source == PackageSource.APT)
-        flatpak_action = next(a for a in actions if a.source == PackageSource.FLATPAK)
-        snap_action = next(a for a in actions if a.source == PackageSource.SNAP)
-        assert apt_action.action_type == ActionType.PURGE
-        assert flatpak_action.action_type == ActionType.REMOVE
-        assert snap_action.action_type == ActionType.PURGE
+        by_source = {a.source: a for a in actions}
+        assert by_source[PackageSource.APT].action_type == ActionType.PURGE
+        assert by_source[PackageSource.FLATPAK].action_type == ActionType.REMOVE
+        assert by_source[PackageSource.SNAP].action_type == ActionType.PURGE
 
 
 class TestDiffToActionsEdgeCases:
     """Tests for edge cases in diff_to_actions()."""
 
-    def test_diff_to_actions_ignores_new(self) -> None:
-        """NEW entries produce no actions."""
-        diff_result = DiffResult(
-            new=(
-                DiffEntry(
-                    name="htop",
-                    source=PackageSource.APT,
-                    diff_type=DiffType.NEW,
-                    version="3.2.2",
-                ),
-                DiffEntry(
-                    name="neofetch",
-                    source=PackageSource.APT,
-                    diff_type=DiffType.NEW,
-                    version="7.1.0",
-                ),
-            ),
-            missing=(),
-            extra=(),
-        )
-
-        actions = diff_to_actions(diff_result)
-
-        assert actions == []
-
-    def test_diff_to_actions_empty_result(self) -> None:
+    def test_diff_to_actions_empty_result(self, empty_diff: DiffResult) -> None:
         """Empty DiffResult produces empty action list."""
-        diff_result = DiffResult(new=(), missing=(), extra=())
-
-        actions = diff_to_actions(diff_result)
+        actions = diff_to_actions(empty_diff)
 
         assert actions == []
 
     def test_diff_to_actions_combined(self) -> None:
-        """Combined NEW + MISSING + EXTRA: only MISSING and EXTRA produce actions."""
-        diff_result = DiffResult(
-            new=(DiffEntry(name="htop", source=PackageSource.APT, diff_type=DiffType.NEW),),
-            missing=(DiffEntry(name="vim", source=PackageSource.APT, diff_type=DiffType.MISSING),),
-            extra=(
-                DiffEntry(name="bloatware", source=PackageSource.APT, diff_type=DiffType.EXTRA),
-            ),
+        """Combined NEW + MISSING + EXTRA: only MISSING and EXTRA produce actions.
+
+        diff_to_actions() never reads diff_result.new; this is the one place that pins it.
+        """
+        diff_result = _make_diff(
+            new=(_HTOP_NEW,), missing=(_VIM_MISSING,), extra=(_BLOATWARE_EXTRA,)
         )
 
         actions = diff_to_actions(diff_result)
@@ -309,16 +234,8 @@ class TestSourceAwareInstallActions:
             ),
             snap=SnapSources(),
         )
-        diff = DiffResult(
-            new=(),
-            missing=(
-                DiffEntry(
-                    name="org.example.App",
-                    source=PackageSource.FLATPAK,
-                    diff_type=DiffType.MISSING,
-                ),
-            ),
-            extra=(),
+        diff = _make_diff(
+            missing=(_make_entry("org.example.App", DiffType.MISSING, PackageSource.FLATPAK),)
         )
 
         actions = diff_to_actions(diff, sources=sources)
@@ -353,13 +270,11 @@ class TestSourceAwareInstallActions:
                 )
             ),
         )
-        diff = DiffResult(
-            new=(),
+        diff = _make_diff(
             missing=(
-                DiffEntry(name="firefox", source=PackageSource.SNAP, diff_type=DiffType.MISSING),
-                DiffEntry(name="bare", source=PackageSource.SNAP, diff_type=DiffType.MISSING),
-            ),
-            extra=(),
+                _make_entry("firefox", DiffType.MISSING, PackageSource.SNAP),
+                _make_entry("bare", DiffType.MISSING, PackageSource.SNAP),
+            )
         )
 
         actions = diff_to_actions(diff, sources=sources)
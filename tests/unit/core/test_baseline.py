@@ -8,6 +8,7 @@ from datetime import UTC, datetime
 
 import pytest
 from popctl.core.baseline import (
+    PROTECTED_PACKAGES,
     is_package_protected,
 )
 from popctl.core.diff import compute_diff, diff_to_actions
@@ -21,6 +22,86 @@ from popctl.models.manifest import (
 from popctl.models.package import PackageSource, PackageStatus, ScannedPackage
 from popctl.scanners.base import Scanner
 
+# Names in PROTECTED_PACKAGES.
+_EXACT_PROTECTED: tuple[str, ...] = (
+    "bash",
+    "coreutils",
+    "sudo",
+    "systemd",
+    "apt",
+    "dpkg",
+    "init",
+)
+
+# Names matched by PROTECTED_PACKAGE_PATTERNS.
+_PATTERN_PROTECTED: tuple[str, ...] = (
+    "linux-image-6.5.0-generic",
+    "linux-headers-generic",
+    "systemd-sysv",
+    "systemd-timesyncd",
+    "pop-default-settings",
+    "pop-icon-theme",
+    "cosmic-applets",
+    "cosmic-files",
+    "system76-driver",
+    "system76-firmware",
+    "grub-common",
+    "grub-efi-amd64",
+    "apt-utils",
+    "apt-transport-https",
+    "dpkg-dev",
+    "gnome-shell",
+    "gnome-shell-common",
+    "gnome-session",
+    "gnome-session-bin",
+    "gnome-session-common",
+    "ubuntu-session",
+    "gdm3",
+    "mutter",
+    "mutter-common",
+    "gnome-settings-daemon",
+    "gnome-settings-daemon-common",
+    "sddm",
+    "sddm-common",
+    "kwin-x11",
+    "plasma-desktop",
+    "plasma-desktop-data",
+    "plasma-workspace",
+    "plasma-workspace-data",
+    "kwin-wayland",
+    "kwin-common",
+    "kwin-data",
+    "plasma-workspace-wayland",
+    "kded5",
+    "kded6",
+    "polkit-kde-agent-1",
+    "plasma-session-x11",
+    "plasma-session-wayland",
+)
+
+# Regular user packages, including near-misses of protected names.
+_NOT_PROTECTED: tuple[str, ...] = (
+    "firefox",
+    "neovim",
+    "git",
+    "docker-ce",
+    "nodejs",
+    "python3-pip",
+    "vscode",
+    "spotify-client",
+    "random-app",
+    "gnome-calculator",
+    "kdeconnect",
+    "gnome-shell-extension-manager",
+    "sddm-theme-breeze",
+    "kwin-addons",
+    "nautilus",
+    "dolphin",
+    "gnome-session-canberra",
+    "mutter-tests",
+    "kded5-dev",
+)
+
 
 class StaticAptScanner(Scanner):
     """Scanner with a fixed set of APT packages for protection tests."""
@@ -43,15 +124,8 @@ class TestIsProtected:
     # Test exact matches
     @pytest.mark.parametrize(
         "package_name",
-        [
-            "bash",
-            "coreutils",
-            "sudo",
-            "systemd",
-            "apt",
-            "dpkg",
-            "init",
-        ],
+        _EXACT_PROTECTED,
+        ids=_EXACT_PROTECTED,
     )
     def test_exact_match_packages_are_protected(self, package_name: str) -> None:
         """Packages in PROTECTED_PACKAGES are protected."""
@@ -60,50 +134,8 @@ class TestIsProtected:
     # Test pattern matches
     @pytest.mark.parametrize(
         "package_name",
-        [
-            "linux-image-6.5.0-generic",
-            "linux-headers-generic",
-            "systemd-sysv",
-            "systemd-timesyncd",
-            "pop-default-settings",
-            "pop-icon-theme",
-            "cosmic-applets",
-            "cosmic-files",
-            "system76-driver",
-            "system76-firmware",
-            "grub-common",
-            "grub-efi-amd64",
-            "apt-utils",
-            "apt-transport-https",
-            "dpkg-dev",
-            "gnome-shell",
-            "gnome-shell-common",
-            "gnome-session",
-            "gnome-session-bin",
-            "gnome-session-common",
-            "ubuntu-session",
-            "gdm3",
-            "mutter",
-            "mutter-common",
-            "gnome-settings-daemon",
-            "gnome-settings-daemon-common",
-            "sddm",
-            "sddm-common",
-            "kwin-x11",
-            "plasma-desktop",
-            "plasma-desktop-data",
-            "plasma-workspace",
-            "plasma-workspace-data",
-            "kwin-wayland",
-            "kwin-common",
-            "kwin-data",
-            "plasma-workspace-wayland",
-            "kded5",
-            "kded6",
-            "polkit-kde-agent-1",
-            "plasma-session-x11",
-            "plasma-session-wayland",
-        ],
+        _PATTERN_PROTECTED,
+        ids=_PATTERN_PROTECTED,
     )
     def test_pattern_match_packages_are_protected(self, package_name: str) -> None:
         """Packages matching PROTECTED_PATTERNS are protected."""
@@ -112,27 +144,8 @@ class TestIsProtected:
     # Test non-protected packages
     @pytest.mark.parametrize(
         "package_name",
-        [
-            "firefox",
-            "neovim",
-            "git",
-            "docker-ce",
-            "nodejs",
-            "python3-pip",
-            "vscode",
-            "spotify-client",
-            "random-app",
-            "gnome-calculator",
-            "kdeconnect",
-            "gnome-shell-extension-manager",
-            "sddm-theme-breeze",
-            "kwin-addons",
-            "nautilus",
-            "dolphin",
-            "gnome-session-canberra",
-            "mutter-tests",
-            "kded5-dev",
-        ],
+        _NOT_PROTECTED,
+        ids=_NOT_PROTECTED,
     )
     def test_non_protected_packages(self, package_name: str) -> None:
         """Regular user packages are not protected."""
@@ -162,6 +175,17 @@ class TestIsProtected:
         assert is_package_protected("LINUX-image-generic") is True
         assert is_package_protected("Linux-Headers-6.5.0") is True
 
+    def test_exact_cases_come_from_protected_packages(self) -> None:
+        """The exact-match cases are real PROTECTED_PACKAGES members, not pattern hits."""
+        assert PROTECTED_PACKAGES.issuperset(_EXACT_PROTECTED)
+
+    def test_repeat_lookups_are_memoized(self) -> None:
+        """A second lookup of the same name is served from the cache."""
+        is_package_protected.cache_clear()
+        assert is_package_protected("linux-image-generic") is True
+        assert is_package_protected("linux-image-generic") is True
+        assert is_package_protected.cache_info().hits == 1
+
     def test_flatpak_style_names_not_protected(self) -> None:
         """Flatpak-style app IDs are not protected by APT patterns."""
         assert is_package_protected("com.spotify.Client") is False
@@ -3,7 +3,8 @@
 Tests for the compute_diff function and related types.
 """
 
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
+from dataclasses import replace
 from datetime import UTC, datetime
 
 import pytest
@@ -13,6 +14,7 @@ from popctl.models.manifest import (
     ManifestMeta,
     PackageConfig,
     PackageEntry,
+    PackageSourceType,
     SystemConfig,
 )
 from popctl.models.package import PackageSource, PackageStatus, ScannedPackage
@@ -29,6 +31,23 @@ from popctl.sources.models import (
     SourcesConfig,
 )
 
+# Manifest timestamps are irrelevant to diffing; a constant keeps fixtures reproducible.
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=UTC)
+
+# Scanned packages shared across tests; ScannedPackage is frozen.
+_FIREFOX_APT = ScannedPackage(
+    name="firefox", source=PackageSource.APT, version="128.0", status=PackageStatus.MANUAL
+)
+_NEOVIM_APT = ScannedPackage(
+    name="neovim", source=PackageSource.APT, version="0.9.5", status=PackageStatus.MANUAL
+)
+_HTOP_APT = ScannedPackage(
+    name="htop", source=PackageSource.APT, version="3.2.2", status=PackageStatus.MANUAL
+)
+_BLOATWARE_APT = ScannedPackage(
+    name="bloatware", source=PackageSource.APT, version="1.0.0", status=PackageStatus.MANUAL
+)
+
 
 class MockScanner(Scanner):
     """Mock scanner for testing."""
@@ -36,7 +55,7 @@ class MockScanner(Scanner):
     def __init__(
         self,
         source: PackageSource,
-        packages: list[ScannedPackage],
+        packages: Sequence[ScannedPackage],
         available: bool = True,
     ) -> None:
         self._source = source
@@ -48,16 +67,18 @@ class MockScanner(Scanner):
         return self._source
 
     def scan(self) -> Iterator[ScannedPackage]:
-        yield from self._packages
+        return iter(self._packages)
 
     def is_available(self) -> bool:
         return self._available
 
 
-@pytest.fixture
+# compute_diff() only reads its manifest, so the fixtures below are built once
+# per module rather than re-validated for every test.
+@pytest.fixture(scope="module")
 def base_manifest() -> Manifest:
     """Create a basic manifest for testing."""
-    now = datetime.now(UTC)
+    now = _FIXED_TS
     return Manifest(
         meta=ManifestMeta(created=now, updated=now),
         system=SystemConfig(name="test-machine"),
@@ -74,10 +95,10 @@ def base_manifest() -> Manifest:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def empty_manifest() -> Manifest:
     """Create an empty manifest for testing."""
-    now = datetime.now(UTC)
+    now = _FIXED_TS
     return Manifest(
         meta=ManifestMeta(created=now, updated=now),
         system=SystemConfig(name="test-machine"),
@@ -134,26 +155,12 @@ class TestDiffResult:
         assert result.is_in_sync is True
         assert result.total_changes == 0
 
-    def test_is_in_sync_false_with_new(self) -> None:
-        """is_in_sync returns False when there are new packages."""
-        entry = DiffEntry(name="htop", source=PackageSource.APT, diff_type=DiffType.NEW)
-        result = DiffResult(new=(entry,), missing=(), extra=())
-
-        assert result.is_in_sync is False
-        assert result.total_changes == 1
-
-    def test_is_in_sync_false_with_missing(self) -> None:
-        """is_in_sync returns False when there are missing packages."""
-        entry = DiffEntry(name="vim", source=PackageSource.APT, diff_type=DiffType.MISSING)
-        result = DiffResult(new=(), missing=(entry,), extra=())
-
-        assert result.is_in_sync is False
-        assert result.total_changes == 1
-
-    def test_is_in_sync_false_with_extra(self) -> None:
-        """is_in_sync returns False when there are extra packages."""
-        entry = DiffEntry(name="bloat", source=PackageSource.APT, diff_type=DiffType.EXTRA)
-        result = DiffResult(new=(), missing=(), extra=(entry,))
+    @pytest.mark.parametrize("diff_type", list(DiffType), ids=lambda t: t.value)
+    def test_is_in_sync_false_with_one_change(self, diff_type: DiffType) -> None:
+        """is_in_sync returns False when any one bucket holds an entry."""
+        entry = DiffEntry(name="pkg", source=PackageSource.APT, diff_type=diff_type)
+        # DiffType values double as the DiffResult bucket names
+        result = replace(DiffResult(new=(), missing=(), extra=()), **{diff_type.value: (entry,)})
 
         assert result.is_in_sync is False
         assert result.total_changes == 1
@@ -175,7 +182,10 @@ class TestDiffResult:
     def test_to_dict(self) -> None:
         """to_dict returns proper dictionary structure."""
         entry = DiffEntry(
-            name="htop", source=PackageSource.APT, diff_type=DiffType.NEW, version="3.2.2",
+            name="htop",
+            source=PackageSource.APT,
+            diff_type=DiffType.NEW,
+            version="3.2.2",
         )
         result = DiffResult(new=(entry,), missing=(), extra=())
 
@@ -210,32 +220,22 @@ class TestComputeDiff:
         # System has exactly what manifest expects (keep packages installed)
         scanner = MockScanner(
             source=PackageSource.APT,
-            packages=[
-                ScannedPackage(
-                    name="firefox",
-                    source=PackageSource.APT,
-                    version="128.0",
-                    status=PackageStatus.MANUAL,
-                ),
-                ScannedPackage(
-                    name="neovim",
-                    source=PackageSource.APT,
-                    version="0.9.5",
-                    status=PackageStatus.MANUAL,
-                ),
-            ],
+            packages=(
+                _FIREFOX_APT,
+                _NEOVIM_APT,
+            ),
         )
 
         flatpak_scanner = MockScanner(
             source=PackageSource.FLATPAK,
-            packages=[
+            packages=(
                 ScannedPackage(
                     name="com.spotify.Client",
                     source=PackageSource.FLATPAK,
                     version="1.2.31",
                     status=PackageStatus.MANUAL,
                 ),
-            ],
+            ),
         )
 
         result = compute_diff(base_manifest, [scanner, flatpak_scanner])
@@ -247,19 +247,9 @@ class TestComputeDiff:
         """Packages installed but not in manifest are detected as NEW."""
         scanner = MockScanner(
             source=PackageSource.APT,
-            packages=[
-                ScannedPackage(
-                    name="firefox",
-                    source=PackageSource.APT,
-                    version="128.0",
-                    status=PackageStatus.MANUAL,
-                ),
-                ScannedPackage(
-                    name="neovim",
-                    source=PackageSource.APT,
-                    version="0.9.5",
-                    status=PackageStatus.MANUAL,
-                ),
+            packages=(
+                _FIREFOX_APT,
+                _NEOVIM_APT,
                 # Extra package not in manifest
                 ScannedPackage(
                     name="htop",
@@ -268,7 +258,7 @@ class TestComputeDiff:
                     status=PackageStatus.MANUAL,
                     description="Interactive process viewer",
                 ),
-            ],
+            ),
         )
 
         result = compute_diff(base_manifest, [scanner])
@@ -282,15 +272,10 @@ class TestComputeDiff:
         """Packages in manifest but not installed are detected as MISSING."""
         scanner = MockScanner(
             source=PackageSource.APT,
-            packages=[
-                ScannedPackage(
-                    name="firefox",
-                    source=PackageSource.APT,
-                    version="128.0",
-                    status=PackageStatus.MANUAL,
-                ),
+            packages=(
+                _FIREFOX_APT,
                 # neovim is missing (in manifest but not installed)
-            ],
+            ),
         )
 
         # Filter to APT only since we only mock APT scanner
@@ -304,27 +289,12 @@ class TestComputeDiff:
         """Packages marked for removal but still installed are detected as EXTRA."""
         scanner = MockScanner(
             source=PackageSource.APT,
-            packages=[
-                ScannedPackage(
-                    name="firefox",
-                    source=PackageSource.APT,
-                    version="128.0",
-                    status=PackageStatus.MANUAL,
-                ),
-                ScannedPackage(
-                    name="neovim",
-                    source=PackageSource.APT,
-                    version="0.9.5",
-                    status=PackageStatus.MANUAL,
-                ),
+            packages=(
+                _FIREFOX_APT,
+                _NEOVIM_APT,
                 # bloatware is marked for removal but still installed
-                ScannedPackage(
-                    name="bloatware",
-                    source=PackageSource.APT,
-                    version="1.0.0",
-                    status=PackageStatus.MANUAL,
-                ),
-            ],
+                _BLOATWARE_APT,
+            ),
         )
 
         result = compute_diff(base_manifest, [scanner])
@@ -337,14 +307,14 @@ class TestComputeDiff:
         """Auto-installed packages are not considered in diff."""
         scanner = MockScanner(
             source=PackageSource.APT,
-            packages=[
+            packages=(
                 ScannedPackage(
                     name="libfoo",
                     source=PackageSource.APT,
                     version="1.0.0",
                     status=PackageStatus.AUTO_INSTALLED,  # Auto-installed
                 ),
-            ],
+            ),
         )
 
         result = compute_diff(empty_manifest, [scanner])
@@ -357,7 +327,7 @@ class TestComputeDiff:
         """Protected system packages are not considered in diff."""
         scanner = MockScanner(
             source=PackageSource.APT,
-            packages=[
+            packages=(
                 ScannedPackage(
                     name="systemd",
                     source=PackageSource.APT,
@@ -370,7 +340,7 @@ class TestComputeDiff:
                     version="6.5.0",
                     status=PackageStatus.MANUAL,
                 ),
-            ],
+            ),
         )
 
         result = compute_diff(empty_manifest, [scanner])
@@ -379,89 +349,50 @@ class TestComputeDiff:
         assert result.is_in_sync is True
         assert result.total_changes == 0
 
-    def test_source_filter_apt(self, base_manifest: Manifest) -> None:
-        """Source filter correctly filters to APT only."""
-        apt_scanner = MockScanner(
-            source=PackageSource.APT,
-            packages=[
-                ScannedPackage(
-                    name="htop",  # New APT package
-                    source=PackageSource.APT,
-                    version="3.2.2",
-                    status=PackageStatus.MANUAL,
-                ),
-            ],
-        )
-
-        flatpak_scanner = MockScanner(
-            source=PackageSource.FLATPAK,
-            packages=[
-                ScannedPackage(
-                    name="io.new.App",  # New Flatpak - should be filtered
-                    source=PackageSource.FLATPAK,
-                    version="1.0",
-                    status=PackageStatus.MANUAL,
-                ),
-            ],
-        )
-
-        result = compute_diff(base_manifest, [apt_scanner, flatpak_scanner], source_filter="apt")
-
-        # Only APT package should appear (htop, firefox missing, neovim missing)
-        new_names = [e.name for e in result.new]
-        missing_names = [e.name for e in result.missing]
-
-        assert "htop" in new_names
-        assert "io.new.App" not in new_names  # Flatpak filtered out
-        # Firefox and neovim should be missing (APT packages in manifest)
-        assert "firefox" in missing_names
-        assert "neovim" in missing_names
-        # Flatpak packages in manifest should not appear in missing
-        assert "com.spotify.Client" not in missing_names
-
-    def test_source_filter_flatpak(self, base_manifest: Manifest) -> None:
-        """Source filter correctly filters to Flatpak only."""
-        apt_scanner = MockScanner(
-            source=PackageSource.APT,
-            packages=[
-                ScannedPackage(
-                    name="htop",
-                    source=PackageSource.APT,
-                    version="3.2.2",
-                    status=PackageStatus.MANUAL,
-                ),
-            ],
-        )
-
-        flatpak_scanner = MockScanner(
-            source=PackageSource.FLATPAK,
-            packages=[
-                ScannedPackage(
-                    name="io.new.App",
-                    source=PackageSource.FLATPAK,
-                    version="1.0",
-                    status=PackageStatus.MANUAL,
+    @pytest.mark.parametrize(
+        ("source_filter", "expected_new", "expected_missing"),
+        [
+            # Manifest keeps: firefox/neovim (apt), com.spotify.Client (flatpak)
+            ("apt", {"htop"}, {"firefox", "neovim"}),
+            ("flatpak", {"io.new.App"}, {"com.spotify.Client"}),
+            ("snap", {"firefox"}, set[str]()),
+        ],
+        ids=["apt", "flatpak", "snap"],
+    )
+    def test_source_filter(
+        self,
+        base_manifest: Manifest,
+        source_filter: PackageSourceType,
+        expected_new: set[str],
+        expected_missing: set[str],
+    ) -> None:
+        """Source filter limits both scanned and manifest packages to one source."""
+        scanners = [
+            MockScanner(
+                source=source,
+                packages=(
+                    ScannedPackage(
+                        name=name, source=source, version="1.0", status=PackageStatus.MANUAL
+                    ),
                 ),
-            ],
-        )
-
-        result = compute_diff(
-            base_manifest, [apt_scanner, flatpak_scanner], source_filter="flatpak"
-        )
+            )
+            for source, name in (
+                (PackageSource.APT, "htop"),
+                (PackageSource.FLATPAK, "io.new.App"),
+                (PackageSource.SNAP, "firefox"),
+            )
+        ]
 
-        new_names = [e.name for e in result.new]
-        missing_names = [e.name for e in result.missing]
+        result = compute_diff(base_manifest, scanners, source_filter=source_filter)
 
-        assert "io.new.App" in new_names
-        assert "htop" not in new_names  # APT filtered out
-        assert "com.spotify.Client" in missing_names
-        assert "firefox" not in missing_names  # APT filtered out
+        assert {e.name for e in result.new} == expected_new
+        assert {e.name for e in result.missing} == expected_missing
 
     def test_results_are_sorted(self, empty_manifest: Manifest) -> None:
         """Results are sorted by source and name."""
         scanner = MockScanner(
             source=PackageSource.APT,
-            packages=[
+            packages=(
                 ScannedPackage(
                     name="zzz", source=PackageSource.APT, version="1.0", status=PackageStatus.MANUAL
                 ),
@@ -471,7 +402,7 @@ class TestComputeDiff:
                 ScannedPackage(
                     name="mmm", source=PackageSource.APT, version="1.0", status=PackageStatus.MANUAL
                 ),
-            ],
+            ),
         )
 
         result = compute_diff(empty_manifest, [scanner])
@@ -483,79 +414,32 @@ class TestComputeDiff:
         """Complex scenario with new, missing, and extra packages."""
         scanner = MockScanner(
             source=PackageSource.APT,
-            packages=[
+            packages=(
                 # firefox exists (in sync)
-                ScannedPackage(
-                    name="firefox",
-                    source=PackageSource.APT,
-                    version="128.0",
-                    status=PackageStatus.MANUAL,
-                ),
+                _FIREFOX_APT,
                 # neovim missing (not in this list)
                 # bloatware still installed (marked for removal)
-                ScannedPackage(
-                    name="bloatware",
-                    source=PackageSource.APT,
-                    version="1.0.0",
-                    status=PackageStatus.MANUAL,
-                ),
+                _BLOATWARE_APT,
                 # htop is new (not in manifest)
-                ScannedPackage(
-                    name="htop",
-                    source=PackageSource.APT,
-                    version="3.2.2",
-                    status=PackageStatus.MANUAL,
-                ),
-            ],
+                _HTOP_APT,
+            ),
         )
 
         # Filter to APT only since we only mock APT scanner
         result = compute_diff(base_manifest, [scanner], source_filter="apt")
 
         assert not result.is_in_sync
-        assert len(result.new) == 1
-        assert result.new[0].name == "htop"
-        assert len(result.missing) == 1
-        assert result.missing[0].name == "neovim"
-        assert len(result.extra) == 1
-        assert result.extra[0].name == "bloatware"
+        # (new, missing, extra) names in one comparison; pytest diffs the mismatching bucket
+        assert (
+            [e.name for e in result.new],
+            [e.name for e in result.missing],
+            [e.name for e in result.extra],
+        ) == (["htop"], ["neovim"], ["bloatware"])
         assert result.total_changes == 3
 
-    def test_source_filter_snap(self, base_manifest: Manifest) -> None:
-        """Source filter correctly filters to Snap only."""
-        apt_scanner = MockScanner(
-            source=PackageSource.APT,
-            packages=[
-                ScannedPackage(
-                    name="htop",
-                    source=PackageSource.APT,
-                    version="3.2.2",
-                    status=PackageStatus.MANUAL,
-                ),
-            ],
-        )
-
-        snap_scanner = MockScanner(
-            source=PackageSource.SNAP,
-            packages=[
-                ScannedPackage(
-                    name="firefox",
-                    source=PackageSource.SNAP,
-                    version="128.0",
-                    status=PackageStatus.MANUAL,
-                ),
-            ],
-        )
-
-        result = compute_diff(base_manifest, [apt_scanner, snap_scanner], source_filter="snap")
-
-        new_names = [e.name for e in result.new]
-        assert "firefox" in new_names
-        assert "htop" not in new_names
-
 
 def _manifest_with_flatpak_contexts(apps: tuple[FlatpakApp, ...]) -> Manifest:
-    now = datetime.now(UTC)
+    now = _FIXED_TS
     remotes = tuple(
         FlatpakRemote(
             name=name,
@@ -605,7 +489,7 @@ class TestFlatpakContextDiff:
         )
         scanner = MockScanner(
             source=PackageSource.FLATPAK,
-            packages=[
+            packages=(
                 ScannedPackage(
                     name="org.example.App",
                     source=PackageSource.FLATPAK,
@@ -614,8 +498,8 @@ class TestFlatpakContextDiff:
                     flatpak_scope="user",
                     flatpak_arch="x86_64",
                     flatpak_branch="stable",
-                )
-            ],
+                ),
+            ),
         )
 
         diff = compute_diff(manifest, [scanner])
@@ -653,7 +537,7 @@ class TestFlatpakContextDiff:
         )
         scanner = MockScanner(
             source=PackageSource.FLATPAK,
-            packages=[
+            packages=(
                 ScannedPackage(
                     name="org.example.App",
                     source=PackageSource.FLATPAK,
@@ -662,8 +546,8 @@ class TestFlatpakContextDiff:
                     flatpak_scope="user",
                     flatpak_arch="x86_64",
                     flatpak_branch="stable",
-                )
-            ],
+                ),
+            ),
         )
 
         diff = compute_diff(manifest, [scanner])
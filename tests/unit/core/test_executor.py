@@ -3,8 +3,11 @@
 Tests operator factory, action execution dispatch, and history recording.
 """
 
-from unittest.mock import MagicMock, patch
+import functools
+from collections.abc import Sequence
+from unittest.mock import MagicMock
 
+import pytest
 from popctl.core.executor import (
     UNHANDLED_ACTION_DETAIL,
     execute_actions,
@@ -15,21 +18,27 @@ from popctl.models.history import HistoryActionType
 from popctl.models.package import PackageSource
 from popctl.operators import get_available_operators
 from popctl.operators.apt import AptOperator
+from popctl.operators.base import Operator
 from popctl.operators.flatpak import FlatpakOperator
 from popctl.operators.snap import SnapOperator
 from popctl.sources.models import FlatpakScope
+from pytest_mock import MockerFixture
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
+@functools.cache
 def _make_action(
     package: str = "test-pkg",
     action_type: ActionType = ActionType.INSTALL,
     source: PackageSource = PackageSource.APT,
 ) -> Action:
-    """Create a test Action."""
+    """Create a test Action.
+
+    Actions are frozen, so identical arguments share one cached instance.
+    """
     return Action(
         action_type=action_type,
         package=package,
@@ -56,17 +65,21 @@ def _make_result(
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture
+def only_apt_available(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Report APT as the only available package manager."""
+    monkeypatch.setattr(AptOperator, "is_available", lambda self: True)
+    monkeypatch.setattr(FlatpakOperator, "is_available", lambda self: False)
+    monkeypatch.setattr(SnapOperator, "is_available", lambda self: False)
+
+
 class TestGetAvailableOperators:
     """Tests for the get_available_operators filter function."""
 
+    @pytest.mark.usefixtures("only_apt_available")
     def test_get_available_operators_filters(self) -> None:
         """Operators that are not available are excluded."""
-        with (
-            patch.object(AptOperator, "is_available", return_value=True),
-            patch.object(FlatpakOperator, "is_available", return_value=False),
-            patch.object(SnapOperator, "is_available", return_value=False),
-        ):
-            ops = get_available_operators()
+        ops = get_available_operators()
 
         assert len(ops) == 1
         assert isinstance(ops[0], AptOperator)
@@ -77,6 +90,29 @@ class TestGetAvailableOperators:
 # ---------------------------------------------------------------------------
 
 
+class _StubOperator(Operator):
+    """Operator stub that records calls and answers from a fixed result list."""
+
+    def __init__(self, source: PackageSource, results: Sequence[ActionResult] = ()) -> None:
+        super().__init__()
+        self.source = source
+        self._results = results
+        self.install_calls: list[list[Action | str]] = []
+        self.remove_calls: list[tuple[list[str], bool]] = []
+
+    def install(self, items: Sequence[Action | str]) -> list[ActionResult]:
+        self.install_calls.append(list(items))
+        names = {item if isinstance(item, str) else item.package for item in items}
+        return [r for r in self._results if r.action.package in names]
+
+    def remove(self, packages: list[str], purge: bool = False) -> list[ActionResult]:
+        self.remove_calls.append((packages, purge))
+        return [r for r in self._results if r.action.package in packages]
+
+    def is_available(self) -> bool:
+        return True
+
+
 class TestExecuteActions:
     """Tests for the execute_actions dispatcher."""
 
@@ -91,49 +127,37 @@ class TestExecuteActions:
         apt_result = _make_result(apt_action)
         flatpak_result = _make_result(flatpak_action)
 
-        apt_op = MagicMock(spec=AptOperator)
-        apt_op.source = PackageSource.APT
-        apt_op.install.return_value = [apt_result]
-
-        flatpak_op = MagicMock(spec=FlatpakOperator)
-        flatpak_op.source = PackageSource.FLATPAK
-        flatpak_op.install.return_value = [flatpak_result]
+        apt_op = _StubOperator(PackageSource.APT, [apt_result])
+        flatpak_op = _StubOperator(PackageSource.FLATPAK, [flatpak_result])
 
         results = execute_actions(
             [apt_action, flatpak_action],
             [apt_op, flatpak_op],
         )
 
-        apt_op.install.assert_called_once_with(["vim"])
-        flatpak_op.install.assert_called_once_with(["com.example.App"])
+        assert apt_op.install_calls == [["vim"]]
+        assert flatpak_op.install_calls == [["com.example.App"]]
         assert results == [apt_result, flatpak_result]
 
-    def test_dispatches_removes_with_purge_false(self) -> None:
-        """Remove actions are dispatched with purge=False."""
-        action = _make_action(package="bloat", action_type=ActionType.REMOVE)
-        result = _make_result(action)
-
-        op = MagicMock(spec=AptOperator)
-        op.source = PackageSource.APT
-        op.remove.return_value = [result]
-
-        results = execute_actions([action], [op])
-
-        op.remove.assert_called_once_with(["bloat"], purge=False)
-        assert results == [result]
-
-    def test_dispatches_purges_with_purge_true(self) -> None:
-        """Purge actions are dispatched with purge=True."""
-        action = _make_action(package="bloat", action_type=ActionType.PURGE)
+    @pytest.mark.parametrize(
+        ("action_type", "purge"),
+        [(ActionType.REMOVE, False), (ActionType.PURGE, True)],
+        ids=["remove", "purge"],
+    )
+    def test_dispatches_removals_with_purge_flag(
+        self,
+        action_type: ActionType,
+        purge: bool,
+    ) -> None:
+        """Remove and purge actions are dispatched with the matching purge flag."""
+        action = _make_action(package="bloat", action_type=action_type)
         result = _make_result(action)
 
-        op = MagicMock(spec=AptOperator)
-        op.source = PackageSource.APT
-        op.remove.return_value = [result]
+        op = _StubOperator(PackageSource.APT, [result])
 
         results = execute_actions([action], [op])
 
-        op.remove.assert_called_once_with(["bloat"], purge=True)
+        assert op.remove_calls == [(["bloat"], purge)]
         assert results == [result]
 
     def test_groups_mixed_action_types(self) -> None:
@@ -146,50 +170,40 @@ class TestExecuteActions:
         remove_result = _make_result(remove_action)
         purge_result = _make_result(purge_action)
 
-        op = MagicMock(spec=AptOperator)
-        op.source = PackageSource.APT
-        op.install.return_value = [install_result]
-        op.remove.side_effect = [[remove_result], [purge_result]]
+        op = _StubOperator(PackageSource.APT, [install_result, remove_result, purge_result])
 
         results = execute_actions(
             [install_action, remove_action, purge_action],
             [op],
         )
 
-        op.install.assert_called_once_with(["vim"])
-        assert op.remove.call_count == 2
-        op.remove.assert_any_call(["bloat"], purge=False)
-        op.remove.assert_any_call(["junk"], purge=True)
+        assert op.install_calls == [["vim"]]
+        assert op.remove_calls == [(["bloat"], False), (["junk"], True)]
         assert results == [install_result, remove_result, purge_result]
 
     def test_empty_list_returns_empty_results(self) -> None:
         """Empty action list returns empty results."""
-        op = MagicMock(spec=AptOperator)
-        op.source = PackageSource.APT
+        op = _StubOperator(PackageSource.APT)
 
         results = execute_actions([], [op])
 
         assert results == []
-        op.install.assert_not_called()
-        op.remove.assert_not_called()
+        assert op.install_calls == []
+        assert op.remove_calls == []
 
     def test_skips_operator_with_no_matching_actions(self) -> None:
         """Operators with no matching actions are skipped entirely."""
         action = _make_action(package="vim", source=PackageSource.APT)
         result = _make_result(action)
 
-        apt_op = MagicMock(spec=AptOperator)
-        apt_op.source = PackageSource.APT
-        apt_op.install.return_value = [result]
-
-        flatpak_op = MagicMock(spec=FlatpakOperator)
-        flatpak_op.source = PackageSource.FLATPAK
+        apt_op = _StubOperator(PackageSource.APT, [result])
+        flatpak_op = _StubOperator(PackageSource.FLATPAK)
 
         results = execute_actions([action], [apt_op, flatpak_op])
 
-        apt_op.install.assert_called_once()
-        flatpak_op.install.assert_not_called()
-        flatpak_op.remove.assert_not_called()
+        assert len(apt_op.install_calls) == 1
+        assert flatpak_op.install_calls == []
+        assert flatpak_op.remove_calls == []
         assert results == [result]
 
     def test_preserves_source_context_when_dispatching_install(self) -> None:
@@ -205,20 +219,16 @@ class TestExecuteActions:
             ),
         )
         result = _make_result(action)
-        operator = MagicMock(spec=FlatpakOperator)
-        operator.source = PackageSource.FLATPAK
-        operator.install.return_value = [result]
+        operator = _StubOperator(PackageSource.FLATPAK, [result])
 
         results = execute_actions([action], [operator])
 
-        operator.install.assert_called_once_with([action])
+        assert operator.install_calls == [[action]]
         assert results == [result]
 
     def test_synthesizes_a_failure_for_an_action_without_an_operator_result(self) -> None:
         action = _make_action(package="vim")
-        operator = MagicMock(spec=AptOperator)
-        operator.source = PackageSource.APT
-        operator.install.return_value = []
+        operator = _StubOperator(PackageSource.APT)
 
         results = execute_actions([action], [operator])
 
@@ -236,16 +246,33 @@ class TestExecuteActions:
 # ---------------------------------------------------------------------------
 
 
+_EXPECTED_ACTION_TO_HISTORY = {
+    ActionType.INSTALL: HistoryActionType.INSTALL,
+    ActionType.REMOVE: HistoryActionType.REMOVE,
+    ActionType.PURGE: HistoryActionType.PURGE,
+}
+
+
+@pytest.fixture(scope="module")
+def install_result() -> ActionResult:
+    """A successful apt install of vim, shared across the module."""
+    return _make_result(_make_action("vim", ActionType.INSTALL), success=True)
+
+
+@pytest.fixture
+def mock_record(mocker: MockerFixture) -> MagicMock:
+    """Patch record_action in the executor module."""
+    return mocker.patch("popctl.core.executor.record_action")
+
+
 class TestRecordActionsToHistory:
     """Tests for the record_actions_to_history function."""
 
-    def test_record_actions_to_history_success(self) -> None:
+    def test_record_actions_to_history_success(
+        self, install_result: ActionResult, mock_record: MagicMock
+    ) -> None:
         """Successful actions are recorded via record_action."""
-        action = _make_action(package="vim", action_type=ActionType.INSTALL)
-        result = _make_result(action, success=True)
-
-        with patch("popctl.core.executor.record_action") as mock_record:
-            record_actions_to_history([result])
+        record_actions_to_history([install_result])
 
         mock_record.assert_called_once()
 
@@ -254,65 +281,63 @@ class TestRecordActionsToHistory:
         assert len(entry.items) == 1
         assert entry.items[0].name == "vim"
 
-    def test_record_actions_to_history_groups_by_type(self) -> None:
+    def test_record_actions_to_history_groups_by_type(
+        self, install_result: ActionResult, mock_record: MagicMock
+    ) -> None:
         """Separate history entries are created per ActionType."""
-        install = _make_action("vim", ActionType.INSTALL, PackageSource.APT)
         remove = _make_action("bloat", ActionType.REMOVE, PackageSource.APT)
 
-        results = [
-            _make_result(install, success=True),
-            _make_result(remove, success=True),
-        ]
-
-        with patch("popctl.core.executor.record_action") as mock_record:
-            record_actions_to_history(results)
+        record_actions_to_history([install_result, _make_result(remove, success=True)])
 
         assert mock_record.call_count == 2
 
         recorded_types = {call.args[0].action_type for call in mock_record.call_args_list}
         assert recorded_types == {HistoryActionType.INSTALL, HistoryActionType.REMOVE}
 
-    def test_record_actions_to_history_custom_command(self) -> None:
-        """The command parameter appears in the history metadata."""
-        action = _make_action()
-        result = _make_result(action, success=True)
+    def test_record_actions_to_history_maps_every_action_type(self, mock_record: MagicMock) -> None:
+        """Each ActionType is recorded under its matching HistoryActionType."""
+        record_actions_to_history(
+            [
+                _make_result(_make_action(action_type.value, action_type))
+                for action_type in ActionType
+            ]
+        )
 
-        with patch("popctl.core.executor.record_action") as mock_record:
-            record_actions_to_history([result], command="popctl sync")
+        recorded = {
+            ActionType(call.args[0].items[0].name): call.args[0].action_type
+            for call in mock_record.call_args_list
+        }
+        assert recorded == _EXPECTED_ACTION_TO_HISTORY
+
+    def test_record_actions_to_history_custom_command(
+        self, install_result: ActionResult, mock_record: MagicMock
+    ) -> None:
+        """The command parameter appears in the history metadata."""
+        record_actions_to_history([install_result], command="popctl sync")
 
         entry = mock_record.call_args[0][0]
         assert entry.metadata["command"] == "popctl sync"
 
-    def test_record_actions_to_history_handles_os_error(self) -> None:
+    def test_record_actions_to_history_handles_os_error(
+        self, install_result: ActionResult, mock_record: MagicMock, mocker: MockerFixture
+    ) -> None:
         """OSError is caught and reported via print_warning, no crash."""
-        action = _make_action()
-        result = _make_result(action, success=True)
+        mock_record.side_effect = OSError("disk full")
+        mock_warn = mocker.patch("popctl.core.executor.print_warning")
 
-        with (
-            patch(
-                "popctl.core.executor.record_action",
-                side_effect=OSError("disk full"),
-            ),
-            patch("popctl.core.executor.print_warning") as mock_warn,
-        ):
-            # Should NOT raise
-            record_actions_to_history([result])
+        # Should NOT raise
+        record_actions_to_history([install_result])
 
         mock_warn.assert_called_once()
         assert "disk full" in mock_warn.call_args[0][0]
 
-    def test_record_actions_to_history_skips_failed(self) -> None:
+    def test_record_actions_to_history_skips_failed(
+        self, install_result: ActionResult, mock_record: MagicMock
+    ) -> None:
         """Failed results are not recorded in history."""
-        ok_action = _make_action("vim", ActionType.INSTALL, PackageSource.APT)
         fail_action = _make_action("bad", ActionType.INSTALL, PackageSource.APT)
 
-        results = [
-            _make_result(ok_action, success=True),
-            _make_result(fail_action, success=False),
-        ]
-
-        with patch("popctl.core.executor.record_action") as mock_record:
-            record_actions_to_history(results)
+        record_actions_to_history([install_result, _make_result(fail_action, success=False)])
 
         mock_record.assert_called_once()
 
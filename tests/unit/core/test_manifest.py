@@ -3,6 +3,7 @@
 Tests for loading and saving manifest files.
 """
 
+import tomllib
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -11,6 +12,7 @@ from popctl.core.manifest import (
     ManifestNotFoundError,
     ManifestParseError,
     ManifestValidationError,
+    dump_manifest,
     load_manifest,
     manifest_exists,
     save_manifest,
@@ -25,6 +27,31 @@ from popctl.models.manifest import (
     SystemConfig,
 )
 
+_FIXED_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+# Hand-written manifest without any domain section, as older popctl wrote it.
+_BASE_MANIFEST_TOML = f"""\
+[meta]
+version = "1.0"
+created = "{_FIXED_NOW.isoformat()}"
+updated = "{_FIXED_NOW.isoformat()}"
+
+[system]
+name = "test-machine"
+
+[packages.keep]
+[packages.remove]
+"""
+
+
+@pytest.fixture(scope="session")
+def saved_manifest_path(
+    tmp_path_factory: pytest.TempPathFactory, _sample_manifest_template: Manifest
+) -> Path:
+    """Save the sample manifest once for tests that only read it back."""
+    manifest_path = tmp_path_factory.mktemp("manifest_ro") / "manifest.toml"
+    return save_manifest(_sample_manifest_template, manifest_path)
+
 
 class TestSaveManifest:
     """Tests for save_manifest function."""
@@ -48,41 +75,30 @@ class TestSaveManifest:
 
         assert manifest_path.exists()
 
-    def test_save_writes_valid_toml(self, tmp_path: Path, sample_manifest: Manifest) -> None:
+    def test_save_writes_valid_toml(self, sample_manifest: Manifest) -> None:
         """save_manifest writes valid TOML content."""
-        import tomllib
-
-        manifest_path = tmp_path / "manifest.toml"
-        save_manifest(sample_manifest, manifest_path)
-
         # Should be parseable TOML
-        with open(manifest_path, "rb") as f:
-            data = tomllib.load(f)
+        data = tomllib.loads(dump_manifest(sample_manifest))
 
         assert "meta" in data
         assert "system" in data
         assert "packages" in data
 
-    def test_save_preserves_data(self, tmp_path: Path, sample_manifest: Manifest) -> None:
+    def test_save_preserves_data(self, sample_manifest: Manifest) -> None:
         """save_manifest preserves all manifest data."""
-        manifest_path = tmp_path / "manifest.toml"
-        save_manifest(sample_manifest, manifest_path)
+        data = tomllib.loads(dump_manifest(sample_manifest))
 
-        loaded = load_manifest(manifest_path)
-
-        assert loaded.system.name == sample_manifest.system.name
-        assert set(loaded.packages.keep.keys()) == set(sample_manifest.packages.keep.keys())
+        assert data["system"]["name"] == sample_manifest.system.name
+        assert data["packages"]["keep"].keys() == sample_manifest.packages.keep.keys()
+        assert data["packages"]["remove"].keys() == sample_manifest.packages.remove.keys()
 
 
 class TestLoadManifest:
     """Tests for load_manifest function."""
 
-    def test_load_valid_manifest(self, tmp_path: Path, sample_manifest: Manifest) -> None:
+    def test_load_valid_manifest(self, saved_manifest_path: Path) -> None:
         """load_manifest loads a valid manifest file."""
-        manifest_path = tmp_path / "manifest.toml"
-        save_manifest(sample_manifest, manifest_path)
-
-        loaded = load_manifest(manifest_path)
+        loaded = load_manifest(saved_manifest_path)
 
         assert loaded.system.name == "test-machine"
         assert len(loaded.packages.keep) == 3
@@ -97,7 +113,7 @@ class TestLoadManifest:
     def test_load_raises_on_invalid_toml(self, tmp_path: Path) -> None:
         """load_manifest raises ManifestParseError for invalid TOML."""
         manifest_path = tmp_path / "invalid.toml"
-        manifest_path.write_text("invalid [ toml content")
+        manifest_path.write_bytes(b"invalid [ toml content")
 
         with pytest.raises(ManifestParseError):
             load_manifest(manifest_path)
@@ -105,7 +121,7 @@ class TestLoadManifest:
     def test_load_raises_on_invalid_schema(self, tmp_path: Path) -> None:
         """load_manifest raises ManifestValidationError for invalid schema."""
         manifest_path = tmp_path / "invalid_schema.toml"
-        manifest_path.write_text('[meta]\nversion = "1.0"\n')  # Missing required fields
+        manifest_path.write_bytes(b'[meta]\nversion = "1.0"\n')  # Missing required fields
 
         with pytest.raises(ManifestValidationError):
             load_manifest(manifest_path)
@@ -114,12 +130,10 @@ class TestLoadManifest:
 class TestManifestExists:
     """Tests for manifest_exists function."""
 
-    def test_returns_true_for_existing_file(
-        self, tmp_path: Path, sample_manifest: Manifest
-    ) -> None:
+    def test_returns_true_for_existing_file(self, tmp_path: Path) -> None:
         """manifest_exists returns True when file exists."""
         manifest_path = tmp_path / "manifest.toml"
-        save_manifest(sample_manifest, manifest_path)
+        manifest_path.touch()
 
         assert manifest_exists(manifest_path) is True
 
@@ -154,7 +168,7 @@ class TestManifestRoundTrip:
 
     def test_preserves_package_entries(self, tmp_path: Path) -> None:
         """Round-trip preserves package entry details."""
-        now = datetime.now(UTC)
+        now = _FIXED_NOW
         manifest = Manifest(
             meta=ManifestMeta(created=now, updated=now),
             system=SystemConfig(name="test"),
@@ -179,14 +193,28 @@ class TestManifestRoundTrip:
         assert "bloat" in loaded.packages.remove
 
 
-@pytest.mark.parametrize("domain", ["filesystem", "configs"])
+@pytest.fixture(scope="module")
+def legacy_manifest(tmp_path_factory: pytest.TempPathFactory) -> Manifest:
+    """Load a manifest written before the domain sections existed.
+
+    The TOML is the same for every domain, so it is parsed once per module.
+    """
+    manifest_path = tmp_path_factory.mktemp("legacy_manifest") / "manifest.toml"
+    manifest_path.write_bytes(_BASE_MANIFEST_TOML.encode())
+    return load_manifest(manifest_path)
+
+
+@pytest.mark.parametrize("domain", ["filesystem", "configs"], scope="class")
 class TestManifestDomainIO:
     """Tests for domain (filesystem/configs) section I/O in manifest."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def manifest_with_domain(self, domain: str) -> Manifest:
-        """Create a manifest with the given domain section."""
-        now = datetime.now(UTC)
+        """Create a manifest with the given domain section.
+
+        Built once per domain; the tests only read it.
+        """
+        now = _FIXED_NOW
         domain_config = DomainConfig(
             keep={
                 "~/.config/nvim": DomainEntry(reason="User config", category="config"),
@@ -207,40 +235,28 @@ class TestManifestDomainIO:
             **{domain: domain_config},
         )
 
-    def test_save_manifest_with_domain(
-        self, tmp_path: Path, manifest_with_domain: Manifest, domain: str
-    ) -> None:
-        """save_manifest includes the domain section in TOML output."""
-        import tomllib
-
-        manifest_path = tmp_path / "manifest.toml"
-        save_manifest(manifest_with_domain, manifest_path)
+    def test_save_manifest_with_domain(self, manifest_with_domain: Manifest, domain: str) -> None:
+        """The domain section is serialized with each entry's reason and category.
 
-        with open(manifest_path, "rb") as f:
-            data = tomllib.load(f)
+        Entries without a reason or category serialize to an empty table.
+        """
+        data = tomllib.loads(dump_manifest(manifest_with_domain))
 
-        assert domain in data
-        assert "keep" in data[domain]
-        assert "remove" in data[domain]
-        assert "~/.config/nvim" in data[domain]["keep"]
-        assert "~/.config/old-app" in data[domain]["remove"]
+        assert data[domain] == {
+            "keep": {
+                "~/.config/nvim": {"reason": "User config", "category": "config"},
+                "~/.config/git": {"reason": "Version control"},
+            },
+            "remove": {
+                "~/.config/old-app": {"reason": "App uninstalled", "category": "stale"},
+                "~/.cache/stale": {},
+            },
+        }
 
     def test_load_manifest_with_domain(self, tmp_path: Path, domain: str) -> None:
         """load_manifest correctly parses the domain section from TOML."""
         manifest_path = tmp_path / "manifest.toml"
-        now = datetime.now(UTC)
-        toml_content = f"""\
-[meta]
-version = "1.0"
-created = "{now.isoformat()}"
-updated = "{now.isoformat()}"
-
-[system]
-name = "test-machine"
-
-[packages.keep]
-[packages.remove]
-
+        toml_content = f"""{_BASE_MANIFEST_TOML}
 [{domain}.keep."~/.config/nvim"]
 reason = "User config"
 category = "config"
@@ -249,7 +265,7 @@ category = "config"
 reason = "App uninstalled"
 category = "stale"
 """
-        manifest_path.write_text(toml_content)
+        manifest_path.write_bytes(toml_content.encode())
 
         loaded = load_manifest(manifest_path)
 
@@ -262,29 +278,11 @@ category = "stale"
         assert section.remove["~/.config/old-app"].reason == "App uninstalled"
 
     def test_load_manifest_without_domain_backward_compat(
-        self, tmp_path: Path, domain: str
+        self, legacy_manifest: Manifest, domain: str
     ) -> None:
         """Existing TOML without the domain section loads without error."""
-        manifest_path = tmp_path / "manifest.toml"
-        now = datetime.now(UTC)
-        toml_content = f"""\
-[meta]
-version = "1.0"
-created = "{now.isoformat()}"
-updated = "{now.isoformat()}"
-
-[system]
-name = "test-machine"
-
-[packages.keep]
-[packages.remove]
-"""
-        manifest_path.write_text(toml_content)
-
-        loaded = load_manifest(manifest_path)
-
-        assert getattr(loaded, domain) is None
-        assert loaded.system.name == "test-machine"
+        assert getattr(legacy_manifest, domain) is None
+        assert legacy_manifest.system.name == "test-machine"
 
     def test_roundtrip_manifest_with_domain(
         self, tmp_path: Path, manifest_with_domain: Manifest, domain: str
@@ -297,8 +295,8 @@ name = "test-machine"
         loaded_section = getattr(loaded, domain)
         original_section = getattr(manifest_with_domain, domain)
         assert loaded_section is not None
-        assert set(loaded_section.keep.keys()) == set(original_section.keep.keys())
-        assert set(loaded_section.remove.keys()) == set(original_section.remove.keys())
+        assert loaded_section.keep.keys() == original_section.keep.keys()
+        assert loaded_section.remove.keys() == original_section.remove.keys()
 
         # Verify entry details survive round-trip
         nvim = loaded_section.keep["~/.config/nvim"]
@@ -309,57 +307,10 @@ name = "test-machine"
         assert old_app.reason == "App uninstalled"
         assert old_app.category == "stale"
 
-    def test_domain_entry_serialization(
-        self, tmp_path: Path, manifest_with_domain: Manifest, domain: str
-    ) -> None:
-        """DomainEntry reason and category are serialized correctly."""
-        import tomllib
-
-        manifest_path = tmp_path / "manifest.toml"
-        save_manifest(manifest_with_domain, manifest_path)
-
-        with open(manifest_path, "rb") as f:
-            data = tomllib.load(f)
-
-        nvim_data = data[domain]["keep"]["~/.config/nvim"]
-        assert nvim_data["reason"] == "User config"
-        assert nvim_data["category"] == "config"
-
-        old_app_data = data[domain]["remove"]["~/.config/old-app"]
-        assert old_app_data["reason"] == "App uninstalled"
-        assert old_app_data["category"] == "stale"
-
-    def test_domain_entry_empty_serialization(self, tmp_path: Path, domain: str) -> None:
-        """DomainEntry with no reason/category produces empty dict."""
-        import tomllib
-
-        now = datetime.now(UTC)
-        manifest = Manifest(
-            meta=ManifestMeta(created=now, updated=now),
-            system=SystemConfig(name="test"),
-            packages=PackageConfig(keep={}, remove={}),
-            **{domain: DomainConfig(keep={}, remove={"~/.cache/stale": DomainEntry()})},
-        )
-
-        manifest_path = tmp_path / "manifest.toml"
-        save_manifest(manifest, manifest_path)
-
-        with open(manifest_path, "rb") as f:
-            data = tomllib.load(f)
-
-        stale_data = data[domain]["remove"]["~/.cache/stale"]
-        assert stale_data == {}
-
     def test_save_manifest_without_domain_omits_section(
-        self, tmp_path: Path, sample_manifest: Manifest, domain: str
+        self, sample_manifest: Manifest, domain: str
     ) -> None:
         """save_manifest omits the domain section when it is None."""
-        import tomllib
-
-        manifest_path = tmp_path / "manifest.toml"
-        save_manifest(sample_manifest, manifest_path)
-
-        with open(manifest_path, "rb") as f:
-            data = tomllib.load(f)
+        data = tomllib.loads(dump_manifest(sample_manifest))
 
         assert domain not in data
@@ -62,46 +62,32 @@ class TestScannedEntry:
         assert entry.mtime is None
         assert entry.orphan_reason is None
 
-    def test_scanned_entry_empty_path_rejected(self) -> None:
-        """Empty path string should raise ValueError."""
-        with pytest.raises(ValueError, match="Path cannot be empty"):
+    @pytest.mark.parametrize(
+        ("path", "confidence", "match"),
+        [
+            pytest.param("", 0.5, "Path cannot be empty", id="empty-path"),
+            pytest.param(
+                "/home/user/.config/test", 1.5, "Confidence must be between", id="confidence-high"
+            ),
+            pytest.param(
+                "/home/user/.config/test", -0.1, "Confidence must be between", id="confidence-low"
+            ),
+        ],
+    )
+    def test_scanned_entry_invalid_fields_rejected(
+        self, path: str, confidence: float, match: str
+    ) -> None:
+        """Empty paths and confidence outside 0.0-1.0 should raise ValueError."""
+        with pytest.raises(ValueError, match=match):
             ScannedEntry(
-                path="",
-                path_type=PathType.FILE,
-                status=OrphanStatus.ORPHAN,
-                size_bytes=None,
-                mtime=None,
-                parent_target="~/.config",
-                orphan_reason=None,
-                confidence=0.5,
-            )
-
-    def test_scanned_entry_invalid_confidence_rejected(self) -> None:
-        """Confidence outside 0.0-1.0 range should raise ValueError."""
-        with pytest.raises(ValueError, match="Confidence must be between"):
-            ScannedEntry(
-                path="/home/user/.config/test",
-                path_type=PathType.DIRECTORY,
-                status=OrphanStatus.ORPHAN,
-                size_bytes=None,
-                mtime=None,
-                parent_target="~/.config",
-                orphan_reason=None,
-                confidence=1.5,
-            )
-
-    def test_scanned_entry_negative_confidence_rejected(self) -> None:
-        """Negative confidence should raise ValueError."""
-        with pytest.raises(ValueError, match="Confidence must be between"):
-            ScannedEntry(
-                path="/home/user/.config/test",
+                path=path,
                 path_type=PathType.DIRECTORY,
                 status=OrphanStatus.ORPHAN,
                 size_bytes=None,
                 mtime=None,
                 parent_target="~/.config",
                 orphan_reason=None,
-                confidence=-0.1,
+                confidence=confidence,
             )
 
     def test_scanned_entry_boundary_confidence(self) -> None:
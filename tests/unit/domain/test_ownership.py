@@ -1,29 +1,28 @@
 """Tests for domain ownership checking functions."""
 
+import os
+from datetime import UTC, datetime
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 from popctl.domain.models import PathType
 from popctl.domain.ownership import (
+    app_name_index,
     app_name_matches,
     classify_path_type,
     dpkg_owns_path,
     get_installed_apps,
+    get_installed_apps_and_packages,
     get_installed_packages,
     get_path_mtime,
     get_path_size,
+    load_dpkg_owned_paths,
 )
 from popctl.utils.shell import CommandResult
 
 _MOCK = "popctl.domain.ownership.run_command"
-
-
-def _dpkg_found() -> CommandResult:
-    return CommandResult(stdout="some-package: /path", stderr="", returncode=0)
-
-
-def _dpkg_not_found() -> CommandResult:
-    return CommandResult(stdout="", stderr="dpkg-query: no path found", returncode=1)
+_DPKG_INFO_DIR = "popctl.domain.ownership.DPKG_INFO_DIR"
 
 
 def _no_result() -> CommandResult:
@@ -31,52 +30,48 @@ def _no_result() -> CommandResult:
 
 
 class TestDpkgOwnsPath:
-    """Tests for dpkg_owns_path function."""
+    """Tests for dpkg_owns_path and load_dpkg_owned_paths."""
 
     def test_owned(self, tmp_path: Path) -> None:
-        """dpkg -S returning 0 means the path is owned."""
+        """A path listed in the owned set is owned."""
         target = tmp_path / "vim"
-        target.mkdir()
-        cache: dict[str, bool] = {}
-
-        with patch(_MOCK, return_value=_dpkg_found()):
-            assert dpkg_owns_path(target, cache) is True
+        assert dpkg_owns_path(target, frozenset({bytes(target)})) is True
 
     def test_not_owned(self, tmp_path: Path) -> None:
-        """dpkg -S returning non-zero means the path is not owned."""
+        """A path missing from the owned set is not owned."""
         target = tmp_path / "unknown"
-        target.mkdir()
-        cache: dict[str, bool] = {}
+        assert dpkg_owns_path(target, frozenset({bytes(tmp_path / "vim")})) is False
 
-        with patch(_MOCK, return_value=_dpkg_not_found()):
-            assert dpkg_owns_path(target, cache) is False
+    def test_load_reads_all_file_lists(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Every *.list file contributes its paths; other files are ignored."""
+        info_dir = tmp_path / "info"
+        info_dir.mkdir()
+        (info_dir / "vim.list").write_text("/.\n/etc/vim\n/etc/vim/vimrc\n")
+        (info_dir / "libc6:amd64.list").write_text("/etc/ld.so.conf.d\n\n")
+        (info_dir / "vim.md5sums").write_text("abc  etc/unrelated\n")
+        monkeypatch.setattr(_DPKG_INFO_DIR, info_dir)
 
-    def test_caching(self, tmp_path: Path) -> None:
-        """Results are cached per path."""
-        target = tmp_path / "app1"
-        target.mkdir()
-        cache: dict[str, bool] = {}
-        call_count = 0
+        owned = load_dpkg_owned_paths()
 
-        def counting_cmd(args: list[str], **_kw: object) -> CommandResult:
-            nonlocal call_count
-            call_count += 1
-            return _dpkg_not_found()
+        assert owned == frozenset({b"/.", b"/etc/vim", b"/etc/vim/vimrc", b"/etc/ld.so.conf.d"})
 
-        with patch(_MOCK, side_effect=counting_cmd):
-            dpkg_owns_path(target, cache)
-            dpkg_owns_path(target, cache)
+    def test_non_utf8_paths_match(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Undecodable file names round-trip through the raw byte set."""
+        info_dir = tmp_path / "info"
+        info_dir.mkdir()
+        (info_dir / "legacy.list").write_bytes(b"/opt/caf\xe9\n")
+        monkeypatch.setattr(_DPKG_INFO_DIR, info_dir)
 
-        assert call_count == 1
+        owned = load_dpkg_owned_paths()
 
-    def test_handles_exception(self, tmp_path: Path) -> None:
-        """FileNotFoundError when dpkg is missing returns False."""
-        target = tmp_path / "app"
-        target.mkdir()
-        cache: dict[str, bool] = {}
+        assert dpkg_owns_path(Path(os.fsdecode(b"/opt/caf\xe9")), owned) is True
 
-        with patch(_MOCK, side_effect=FileNotFoundError("dpkg not found")):
-            assert dpkg_owns_path(target, cache) is False
+    def test_load_missing_database(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A system without a dpkg database owns nothing."""
+        monkeypatch.setattr(_DPKG_INFO_DIR, tmp_path / "missing")
+        assert load_dpkg_owned_paths() == frozenset()
 
 
 class TestGetInstalledPackages:
@@ -179,28 +174,75 @@ class TestGetInstalledApps:
         assert apps == set()
 
 
+class TestGetInstalledAppsAndPackages:
+    """Tests for get_installed_apps_and_packages function."""
+
+    def test_combines_all_probes(self) -> None:
+        """Apps come from flatpak and snap, packages from dpkg-query."""
+
+        def route(args: list[str], **_kw: object) -> CommandResult:
+            if args[0] == "flatpak":
+                return CommandResult(stdout="org.mozilla.firefox\n", stderr="", returncode=0)
+            if args[0] == "snap":
+                return CommandResult(
+                    stdout="Name  Ver  Rev  Track  Pub  Notes\nspotify  1  1  s  s  -\n",
+                    stderr="",
+                    returncode=0,
+                )
+            if args[0] == "dpkg-query":
+                return CommandResult(stdout="vim\ncurl\n", stderr="", returncode=0)
+            return _no_result()
+
+        with patch(_MOCK, side_effect=route):
+            apps, packages = get_installed_apps_and_packages()
+
+        assert apps == {"org.mozilla.firefox", "spotify"}
+        assert packages == {"vim", "curl"}
+
+    def test_one_missing_tool_does_not_hide_others(self) -> None:
+        """A missing probe contributes nothing while the others still report."""
+
+        def route(args: list[str], **_kw: object) -> CommandResult:
+            if args[0] == "dpkg-query":
+                return CommandResult(stdout="vim\n", stderr="", returncode=0)
+            raise FileNotFoundError(args[0])
+
+        with patch(_MOCK, side_effect=route):
+            apps, packages = get_installed_apps_and_packages()
+
+        assert apps == set()
+        assert packages == {"vim"}
+
+
 class TestAppNameMatches:
-    """Tests for app_name_matches function."""
+    """Tests for app_name_matches and app_name_index."""
 
     def test_exact_match(self) -> None:
         """Exact case-insensitive matching works."""
-        apps = {"spotify", "discord"}
-        assert app_name_matches("spotify", apps) is True
-        assert app_name_matches("Spotify", apps) is True
-        assert app_name_matches("unknown", apps) is False
+        index = app_name_index({"spotify", "discord"})
+        assert app_name_matches("spotify", index) is True
+        assert app_name_matches("Spotify", index) is True
+        assert app_name_matches("unknown", index) is False
 
     def test_reverse_dns_component(self) -> None:
         """Reverse-DNS component matching works."""
-        apps = {"org.mozilla.firefox", "org.gnome.Calculator"}
-        assert app_name_matches("firefox", apps) is True
-        assert app_name_matches("Calculator", apps) is True
-        assert app_name_matches("unknown", apps) is False
+        index = app_name_index({"org.mozilla.firefox", "org.gnome.Calculator"})
+        assert app_name_matches("firefox", index) is True
+        assert app_name_matches("Calculator", index) is True
+        assert app_name_matches("org.mozilla.firefox", index) is True
+        assert app_name_matches("unknown", index) is False
 
     def test_no_partial_match(self) -> None:
         """Partial string matches are not accepted."""
-        apps = {"org.mozilla.firefox"}
-        assert app_name_matches("fire", apps) is False
-        assert app_name_matches("fox", apps) is False
+        index = app_name_index({"org.mozilla.firefox"})
+        assert app_name_matches("fire", index) is False
+        assert app_name_matches("fox", index) is False
+
+    def test_index_is_lowercased(self) -> None:
+        """The index holds lowercased IDs and components only."""
+        assert app_name_index({"org.gnome.Calculator"}) == frozenset(
+            {"org.gnome.calculator", "org", "gnome", "calculator"}
+        )
 
 
 class TestGetPathSize:
@@ -224,16 +266,61 @@ class TestGetPathSize:
         assert size is not None
         assert size == 7  # 3 + 4 bytes
 
+    def test_nested_directory_size(self, tmp_path: Path) -> None:
+        """Files in nested subdirectories are included; linked directories are not walked."""
+        d = tmp_path / "mydir"
+        (d / "sub" / "deeper").mkdir(parents=True)
+        (d / "a.txt").write_text("aa")
+        (d / "sub" / "deeper" / "b.txt").write_text("bbbbb")
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "big.txt").write_text("x" * 100)
+        (d / "link").symlink_to(outside)
+        assert get_path_size(d) == 7  # 2 + 5 bytes
+
     def test_empty_directory(self, tmp_path: Path) -> None:
         """Empty directory returns 0."""
         d = tmp_path / "empty"
         d.mkdir()
         assert get_path_size(d) == 0
 
+    def test_entry_cap_reports_unknown(self, tmp_path: Path) -> None:
+        """A tree with more entries than the cap is reported as None, not a partial sum."""
+        d = tmp_path / "mydir"
+        (d / "sub").mkdir(parents=True)
+        for i in range(3):
+            (d / "sub" / f"{i}.txt").write_text("x")
+        assert get_path_size(d, entry_cap=3) is None
+        assert get_path_size(d, entry_cap=4) == 3
+
+    def test_accepts_str_path(self, tmp_path: Path) -> None:
+        """Scanners pass plain strings; they size the same as Path objects."""
+        d = tmp_path / "mydir"
+        d.mkdir()
+        (d / "a.txt").write_text("aaa")
+        assert get_path_size(str(d)) == get_path_size(d) == 3
+
     def test_nonexistent_returns_none(self, tmp_path: Path) -> None:
         """Nonexistent path returns None."""
         assert get_path_size(tmp_path / "nonexistent") is None
 
+    def test_symlink_to_directory_reports_link_size(self, tmp_path: Path) -> None:
+        """A symlinked directory is not walked; the link's own size is reported."""
+        d = tmp_path / "mydir"
+        d.mkdir()
+        (d / "a.txt").write_text("a" * 50)
+        link = tmp_path / "link"
+        link.symlink_to(d)
+        assert get_path_size(link) == link.lstat().st_size
+
+    def test_uses_prefetched_lstat(self, tmp_path: Path) -> None:
+        """A caller-supplied lstat result is used instead of re-statting the path."""
+        f = tmp_path / "file.txt"
+        f.write_text("hello")
+        lstat = f.lstat()
+        f.unlink()
+        assert get_path_size(f, lstat) == 5
+
 
 class TestGetPathMtime:
     """Tests for get_path_mtime function."""
@@ -250,6 +337,14 @@ class TestGetPathMtime:
         """Nonexistent path returns None for mtime."""
         assert get_path_mtime(tmp_path / "nonexistent") is None
 
+    def test_uses_prefetched_lstat(self, tmp_path: Path) -> None:
+        """A caller-supplied lstat result is used instead of re-statting the path."""
+        f = tmp_path / "file.txt"
+        f.write_text("content")
+        lstat = f.lstat()
+        f.unlink()
+        assert get_path_mtime(f, lstat) == datetime.fromtimestamp(lstat.st_mtime, UTC).isoformat()
+
 
 class TestClassifyPathType:
     """Tests for classify_path_type function."""
@@ -279,3 +374,17 @@ class TestClassifyPathType:
         link = tmp_path / "dead"
         link.symlink_to(tmp_path / "nonexistent")
         assert classify_path_type(link) == PathType.DEAD_SYMLINK
+        assert classify_path_type(str(link)) == PathType.DEAD_SYMLINK
+
+    def test_uses_prefetched_lstat(self, tmp_path: Path) -> None:
+        """A caller-supplied lstat result decides the type without re-statting."""
+        d = tmp_path / "mydir"
+        d.mkdir()
+        lstat = d.lstat()
+        d.rmdir()
+        assert classify_path_type(d, lstat) == PathType.DIRECTORY
+
+    def test_missing_path_raises(self, tmp_path: Path) -> None:
+        """A path that no longer exists surfaces the OSError to the caller."""
+        with pytest.raises(FileNotFoundError):
+            classify_path_type(tmp_path / "gone")
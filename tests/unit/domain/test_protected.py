@@ -188,6 +188,15 @@ class TestIsProtectedShared:
             # Original home should no longer match
             assert is_protected("/real/home/.ssh/id_rsa", domain) is False
 
+    @pytest.mark.parametrize("domain", _DOMAIN_PARAMS)
+    def test_home_change_is_picked_up(self, domain: Literal["filesystem", "configs"]) -> None:
+        """Compiled patterns follow Path.home() instead of sticking to the first home seen."""
+        with patch.object(Path, "home", return_value=Path("/first/home")):
+            assert is_protected("/first/home/.ssh/id_rsa", domain) is True
+        with patch.object(Path, "home", return_value=Path("/second/home")):
+            assert is_protected("/first/home/.ssh/id_rsa", domain) is False
+            assert is_protected("/second/home/.ssh/id_rsa", domain) is True
+
 
 # ---------------------------------------------------------------------------
 # Filesystem-specific tests
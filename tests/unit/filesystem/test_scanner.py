@@ -9,16 +9,6 @@ from popctl.filesystem.scanner import FilesystemScanner
 from popctl.utils.shell import CommandResult
 
 
-def _dpkg_not_found(*_args: object, **_kwargs: object) -> CommandResult:
-    """Simulate dpkg -S returning 'not found' (package does not own path)."""
-    return CommandResult(stdout="", stderr="dpkg-query: no path found", returncode=1)
-
-
-def _dpkg_found(*_args: object, **_kwargs: object) -> CommandResult:
-    """Simulate dpkg -S returning success (package owns path)."""
-    return CommandResult(stdout="some-package: /path", stderr="", returncode=0)
-
-
 def _no_apps(*_args: object, **_kwargs: object) -> CommandResult:
     """Simulate flatpak/snap returning no apps."""
     return CommandResult(stdout="", stderr="", returncode=1)
@@ -48,8 +38,6 @@ def _snap_apps() -> CommandResult:
 def _route_command(args: list[str], **_kwargs: object) -> CommandResult:
     """Route mock commands based on the command being called."""
     cmd = args[0] if args else ""
-    if cmd == "dpkg":
-        return _dpkg_not_found()
     if cmd == "flatpak":
         return _flatpak_apps()
     if cmd == "snap":
@@ -66,8 +54,6 @@ def _route_command(args: list[str], **_kwargs: object) -> CommandResult:
 def _route_command_no_apps(args: list[str], **_kwargs: object) -> CommandResult:
     """Route commands but all external tools return nothing."""
     cmd = args[0] if args else ""
-    if cmd == "dpkg":
-        return _dpkg_not_found()
     if cmd in ("flatpak", "snap", "dpkg-query"):
         return _no_apps()
     return CommandResult(stdout="", stderr="", returncode=1)
@@ -161,12 +147,13 @@ class TestScanSkipsOwnedPackages:
         owned_dir = config / "vim"
         owned_dir.mkdir()
 
-        def route(args: list[str], **_kw: object) -> CommandResult:
-            if args[0] == "dpkg" and args[1] == "-S":
-                return _dpkg_found()
-            return _no_apps()
-
-        with patch("popctl.domain.ownership.run_command", side_effect=route):
+        with (
+            patch("popctl.domain.ownership.run_command", side_effect=_no_apps),
+            patch(
+                "popctl.filesystem.scanner.load_dpkg_owned_paths",
+                return_value=frozenset({bytes(owned_dir)}),
+            ),
+        ):
             scanner = FilesystemScanner(targets=(config,))
             results = list(scanner.scan())
 
@@ -537,30 +524,25 @@ class TestScanIntegration:
         config.mkdir()
         (config / "app1").mkdir()
 
-        dpkg_call_count = 0
-
-        def counting_route(args: list[str], **_kw: object) -> CommandResult:
-            nonlocal dpkg_call_count
-            if args[0] == "dpkg":
-                dpkg_call_count += 1
-                return _dpkg_not_found()
-            return _no_apps()
-
-        with patch("popctl.domain.ownership.run_command", side_effect=counting_route):
+        with (
+            patch("popctl.domain.ownership.run_command", side_effect=_no_apps),
+            patch(
+                "popctl.filesystem.scanner.load_dpkg_owned_paths", return_value=frozenset()
+            ) as mock_load,
+        ):
             scanner = FilesystemScanner(targets=(config,))
 
-            # First scan populates the dpkg cache
+            # First scan populates the dpkg owned-path set
             list(scanner.scan())
-            first_count = dpkg_call_count
+            first_count = mock_load.call_count
 
-            # Second scan should reset and re-query dpkg
+            # Second scan should reset and re-read the dpkg database
             list(scanner.scan())
-            second_count = dpkg_call_count - first_count
+            second_count = mock_load.call_count - first_count
 
-        # Both scans should call dpkg the same number of times
+        # Each scan reads the dpkg database exactly once
         # (caches are reset between scans)
-        assert first_count == second_count
-        assert first_count > 0
+        assert first_count == second_count == 1
 
     @patch("popctl.domain.ownership.run_command", side_effect=_route_command_no_apps)
     @patch("popctl.filesystem.scanner.is_protected", return_value=False)